@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for bug_detector.py
+==============================
+
+Generates synthetic JavaScript corpora of controlled size and shape and times
+CodeAnalyzer.analyze_all_files, ConfigValidator.validate_configs and
+BugDetector.generate_report against them. Each corpus runs in a fresh process
+so peak RSS is measured per corpus. Results can be saved as a baseline and
+compared against later runs; everything works offline.
+
+Startup cost is measured separately with python -X importtime, once for the
+CLI (the static-only path) and once for the API tester, in fresh interpreters.
+
+Corpora:
+- small_files: many small Express controllers and routes
+- huge_files: a few files above the large-file threshold
+- sql_templates: dense SQL template literals with interpolation
+- nested_loops: deeply nested loops and callbacks
+- minified: long single-line bundles
+
+Usage:
+    python bug_detector_bench.py --save-baseline
+    python bug_detector_bench.py --compare
+    python bug_detector_bench.py --startup-only
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import resource
+import statistics
+import subprocess
+import multiprocessing
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from datetime import datetime
+
+CORPUS_VERSION = 4
+DEFAULT_BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                     'bug_detector_bench_baseline.json')
+
+# Modules imported by the startup benchmark: the CLI, which is all a static
+# scan loads, and the API tester, which pulls in the HTTP stack
+STARTUP_TARGETS = {'static': 'bugdetector.cli', 'api': 'bugdetector.api'}
+NETWORK_MODULES = ('aiohttp', 'asyncio', 'requests', 'urllib3')
+
+IDENTIFIERS = ['user', 'order', 'invoice', 'quota', 'dispute', 'workflow', 'tenant',
+               'payment', 'account', 'region', 'product', 'report']
+TABLES = ['users', 'orders', 'invoices', 'quotas', 'disputes', 'workflows', 'payments']
+
+def _controller(rng: random.Random, index: int) -> str:
+    """Return an Express controller with a route, a query and some async code"""
+    name = rng.choice(IDENTIFIERS)
+    table = rng.choice(TABLES)
+    return f"""const express = require('express');
+const db = require('../config/db');
+const router = express.Router();
+
+// {name} controller {index}
+router.get('/api/{name}s/:id', async (req, res) => {{
+  const {{ id }} = req.params;
+  const rows = await db.query(`SELECT * FROM {table} WHERE id = ${{id}}`);
+  if (rows.length == 0) {{
+    return res.status(404).json({{ message: '{name} not found' }});
+  }}
+  console.log('{name} loaded', id);
+  res.json(rows[0]);
+}});
+
+router.post('/api/{name}s', async (req, res) => {{
+  try {{
+    const result = await db.query('INSERT INTO {table} (name) VALUES ($1)', [req.body.name]);
+    res.status(201).json(result.rows[0]);
+  }} catch (error) {{
+    res.status(500).json({{ error: error.message }});
+  }}
+}});
+
+function load{name.title()}Totals(items) {{
+  let total = 0;
+  for (let i = 0; i < items.length; i++) {{
+    total += items[i].amount;
+  }}
+  setInterval(() => refresh{name.title()}(), 60000);
+  return total;
+}}
+
+module.exports = router;
+"""
+
+def _sql_block(rng: random.Random) -> str:
+    table = rng.choice(TABLES)
+    column = rng.choice(IDENTIFIERS)
+    return (f"  const {column}Rows = await pool.query(`SELECT {column}_id, name FROM {table} "
+            f"WHERE {column}_id = ${{req.query.{column}}} AND tenant = '${{tenantId}}' "
+            f"ORDER BY ${{req.query.sort}}`);\n")
+
+def _nested_loops(rng: random.Random, depth: int) -> str:
+    lines = ["function crunch(matrix) {", "  let acc = 0;"]
+    for level in range(depth):
+        indent = "  " * (level + 1)
+        var = chr(ord('a') + level)
+        lines.append(f"{indent}for (let {var} = 0; {var} < matrix.length; {var}++) {{")
+    inner = "  " * (depth + 1)
+    lines.append(f"{inner}acc += matrix[a].length * {rng.randint(1, 9)};")
+    lines.append(f"{inner}matrix.forEach(row => row.map(cell => cell.filter(x => x)));")
+    for level in reversed(range(depth)):
+        lines.append("  " * (level + 1) + "}")
+    lines.append("  return acc;")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+def _write(path: Path, text: str) -> int:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = text.encode('utf-8')
+    path.write_bytes(data)
+    return len(data)
+
+def _write_config(root: Path, rng: random.Random):
+    """Add the package.json and .env files ConfigValidator looks at"""
+    _write(root / 'package.json', json.dumps({
+        'name': 'bench-service',
+        'version': '1.0.0',
+        'dependencies': {'express': '^4.18.2', 'lodash': '4.17.15', 'pg': '*'},
+    }, indent=2))
+    _write(root / '.env', f"DB_PASSWORD=secret{rng.randint(0, 999)}\nJWT_SECRET=changeme\nPORT=3000\n")
+
+def gen_small_files(root: Path, scale: float, rng: random.Random) -> None:
+    for index in range(max(1, int(2000 * scale))):
+        service = f"service-{index % 20}"
+        _write(root / service / 'src' / 'controllers' / f"controller{index}.js", _controller(rng, index))
+
+def gen_huge_files(root: Path, scale: float, rng: random.Random) -> None:
+    from bugdetector.constants import DEFAULT_LARGE_FILE_THRESHOLD
+    # Whatever the scale, the files must take the large-file (mmap) path
+    target = max(int(6 * 1024 * 1024 * scale), DEFAULT_LARGE_FILE_THRESHOLD + 512 * 1024)
+    for index in range(3):
+        parts = []
+        size = 0
+        while size < target:
+            part = _controller(rng, size)
+            parts.append(part)
+            size += len(part)
+        _write(root / 'bundle' / f"huge{index}.js", "".join(parts))
+
+def gen_sql_templates(root: Path, scale: float, rng: random.Random) -> None:
+    for index in range(max(1, int(200 * scale))):
+        body = "".join(_sql_block(rng) for _ in range(100))
+        _write(root / 'repositories' / f"repo{index}.js",
+               f"async function query{index}(req, res, pool, tenantId) {{\n{body}}}\n"
+               f"module.exports = {{ query{index} }};\n")
+
+def gen_nested_loops(root: Path, scale: float, rng: random.Random) -> None:
+    for index in range(max(1, int(300 * scale))):
+        text = "".join(_nested_loops(rng, rng.randint(3, 8)) for _ in range(20))
+        _write(root / 'compute' / f"crunch{index}.js", text)
+
+def gen_minified(root: Path, scale: float, rng: random.Random) -> None:
+    # Bundles keep realistic sizes (0.5-1.5 MB on one line) at any scale; the
+    # scale only sets how many there are
+    for index in range(max(1, int(3 * scale))):
+        target = rng.randint(512 * 1024, 1536 * 1024)
+        parts = []
+        size = 0
+        while size < target:
+            # Line comments would swallow the rest of a one-line bundle, so
+            # they are dropped as a minifier would
+            code = "\n".join(line for line in _controller(rng, size).splitlines()
+                             if not line.lstrip().startswith('//'))
+            part = " ".join(code.split())
+            parts.append(part)
+            size += len(part)
+        _write(root / 'public' / 'js' / f"app{index}.min.js", ";".join(parts))
+
+CORPORA: Dict[str, Callable[[Path, float, random.Random], None]] = {
+    'small_files': gen_small_files,
+    'huge_files': gen_huge_files,
+    'sql_templates': gen_sql_templates,
+    'nested_loops': gen_nested_loops,
+    'minified': gen_minified,
+}
+
+def generate_corpus(name: str, root: Path, scale: float = 1.0, seed: int = 0) -> Path:
+    """Generate a corpus under root/name, reusing it if it was built with the same settings"""
+    corpus = root / name
+    manifest_path = corpus / 'corpus.json'
+    manifest = {'corpus': name, 'version': CORPUS_VERSION, 'scale': scale, 'seed': seed}
+    if manifest_path.exists():
+        try:
+            if json.loads(manifest_path.read_text()) == manifest:
+                return corpus
+        except (OSError, ValueError):
+            pass
+
+    if corpus.exists():
+        for dirpath, dirnames, filenames in os.walk(corpus, topdown=False):
+            for filename in filenames:
+                os.remove(os.path.join(dirpath, filename))
+            for dirname in dirnames:
+                os.rmdir(os.path.join(dirpath, dirname))
+    rng = random.Random(f"{name}:{seed}")
+    CORPORA[name](corpus, scale, rng)
+    _write_config(corpus, rng)
+    manifest_path.write_text(json.dumps(manifest))
+    return corpus
+
+def _peak_rss_kb() -> int:
+    """Return peak RSS in KiB of this process and its reaped children"""
+    self_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    child_peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    peak = max(self_peak, child_peak)
+    # ru_maxrss is bytes on macOS and KiB elsewhere
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+def _run_case(conn, corpus: str, jobs: int, repeat: int, structural: bool = False):
+    """Benchmark one corpus in a fresh process and send the measurements back"""
+    from bugdetector import BugDetector, CodeAnalyzer, ConfigValidator, ProjectWalker
+
+    walker = ProjectWalker(corpus)
+    js_files = walker.files('js')
+    total_bytes = sum(os.path.getsize(path) for path in js_files)
+
+    timings: Dict[str, List[float]] = {'analyze_all_files': [], 'validate_configs': [], 'generate_report': []}
+    findings = 0
+    for _ in range(repeat):
+        analyzer = CodeAnalyzer(corpus, walker=walker, structural=structural)
+        start = time.perf_counter()
+        static = analyzer.analyze_all_files(jobs=jobs)
+        timings['analyze_all_files'].append(time.perf_counter() - start)
+
+        validator = ConfigValidator(corpus, walker=walker)
+        start = time.perf_counter()
+        config = validator.validate_configs()
+        timings['validate_configs'].append(time.perf_counter() - start)
+
+        detector = BugDetector(corpus)
+        start = time.perf_counter()
+        detector.generate_report({'static_analysis': static, 'config_validation': config, 'api_testing': []})
+        timings['generate_report'].append(time.perf_counter() - start)
+        findings = len(static) + len(config)
+
+    conn.send({
+        'files': len(js_files),
+        'bytes': total_bytes,
+        'findings': findings,
+        'timings': timings,
+        'peak_rss_kb': _peak_rss_kb(),
+    })
+    conn.close()
+
+def run_benchmark(corpus: Path, jobs: int = 1, repeat: int = 3, structural: bool = False) -> Dict:
+    """Run one corpus in a spawned process and summarize its timings"""
+    context = multiprocessing.get_context('spawn')
+    parent_conn, child_conn = context.Pipe(duplex=False)
+    process = context.Process(target=_run_case, args=(child_conn, str(corpus), jobs, repeat, structural))
+    process.start()
+    child_conn.close()
+    try:
+        raw = parent_conn.recv()
+    except EOFError:
+        raise RuntimeError(f"Benchmark process for {corpus} exited with code {process.exitcode}")
+    finally:
+        process.join()
+
+    megabytes = raw['bytes'] / (1024 * 1024)
+    stages = {}
+    for stage, samples in raw['timings'].items():
+        stages[stage] = {'median_s': round(statistics.median(samples), 6), 'min_s': round(min(samples), 6)}
+    analyze = stages['analyze_all_files']['median_s'] or 1e-9
+    return {
+        'files': raw['files'],
+        'bytes': raw['bytes'],
+        'findings': raw['findings'],
+        'stages': stages,
+        'mb_per_s': round(megabytes / analyze, 3),
+        'files_per_s': round(raw['files'] / analyze, 1),
+        'peak_rss_mb': round(raw['peak_rss_kb'] / 1024, 1),
+    }
+
+def run_suite(corpus_root: Path, names: List[str], scale: float, seed: int,
+              jobs: int, repeat: int, structural: bool = False) -> Dict:
+    """Generate and benchmark each named corpus"""
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from bugdetector import DETECTOR_VERSION
+
+    results = {}
+    for name in names:
+        corpus = generate_corpus(name, corpus_root, scale, seed)
+        print(f"Benchmarking {name} ...", flush=True)
+        results[name] = run_benchmark(corpus, jobs, repeat, structural)
+    return {
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'detector_version': DETECTOR_VERSION,
+        'python': platform.python_version(),
+        'machine': f"{platform.system()} {platform.machine()}",
+        'cpus': os.cpu_count(),
+        'settings': {'scale': scale, 'seed': seed, 'jobs': jobs, 'repeat': repeat,
+                     'corpus_version': CORPUS_VERSION, 'structural': structural},
+        'corpora': results,
+    }
+
+def _import_profile(module: str) -> Dict:
+    """Import module in a fresh interpreter under -X importtime and summarize its cost"""
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                               cwd=os.path.dirname(os.path.abspath(__file__)),
+                               capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - start
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    cumulative = {}
+    for line in completed.stderr.splitlines():
+        fields = line.split('|')
+        if len(fields) == 3 and fields[1].strip().isdigit():
+            cumulative[fields[2].strip()] = int(fields[1])
+    return {
+        'import_ms': cumulative.get(module, 0) / 1000,
+        'process_ms': wall * 1000,
+        'modules': len(cumulative),
+        'network_modules': sorted(name for name in cumulative if name in NETWORK_MODULES),
+    }
+
+def measure_startup(repeat: int = 5) -> Dict:
+    """Return median import and process times for each startup target"""
+    results = {}
+    for name, module in STARTUP_TARGETS.items():
+        samples = [_import_profile(module) for _ in range(max(repeat, 1))]
+        results[name] = {
+            'module': module,
+            'import_ms': round(statistics.median(sample['import_ms'] for sample in samples), 1),
+            'process_ms': round(statistics.median(sample['process_ms'] for sample in samples), 1),
+            'modules': samples[-1]['modules'],
+            'network_modules': samples[-1]['network_modules'],
+        }
+    return results
+
+def _delta(current: float, previous: float) -> str:
+    if not previous:
+        return "     n/a"
+    return f"{(current - previous) / previous * 100:+7.1f}%"
+
+def format_results(run: Dict, baseline: Optional[Dict] = None) -> str:
+    """Return a table of results, with percentage changes against a baseline"""
+    lines = [] if not run['corpora'] else [f"{'corpus':<14} {'files':>6} {'MB':>8} {'findings':>9} {'analyze s':>10} "
+             f"{'MB/s':>8} {'files/s':>9} {'config s':>9} {'report s':>9} {'RSS MB':>7}"]
+    if lines:
+        lines.append("-" * len(lines[0]))
+    for name, result in run['corpora'].items():
+        stages = result['stages']
+        lines.append(
+            f"{name:<14} {result['files']:>6} {result['bytes'] / 1048576:>8.2f} {result['findings']:>9} "
+            f"{stages['analyze_all_files']['median_s']:>10.3f} {result['mb_per_s']:>8.2f} "
+            f"{result['files_per_s']:>9.1f} {stages['validate_configs']['median_s']:>9.3f} "
+            f"{stages['generate_report']['median_s']:>9.3f} {result['peak_rss_mb']:>7.1f}"
+        )
+        previous = (baseline or {}).get('corpora', {}).get(name)
+        if previous:
+            previous_stages = previous['stages']
+            lines.append(
+                f"{'  vs baseline':<14} {'':>6} {'':>8} {result['findings'] - previous['findings']:>+9} "
+                f"{_delta(stages['analyze_all_files']['median_s'], previous_stages['analyze_all_files']['median_s']):>10} "
+                f"{_delta(result['mb_per_s'], previous['mb_per_s']):>8} "
+                f"{_delta(result['files_per_s'], previous['files_per_s']):>9} "
+                f"{_delta(stages['validate_configs']['median_s'], previous_stages['validate_configs']['median_s']):>9} "
+                f"{_delta(stages['generate_report']['median_s'], previous_stages['generate_report']['median_s']):>9} "
+                f"{_delta(result['peak_rss_mb'], previous['peak_rss_mb']):>7}"
+            )
+    if run.get('startup'):
+        if lines:
+            lines.append("")
+        lines.append(f"{'startup':<14} {'module':<18} {'import ms':>10} {'process ms':>11} {'modules':>8}  network modules")
+        for name, result in run['startup'].items():
+            lines.append(
+                f"{name:<14} {result['module']:<18} {result['import_ms']:>10.1f} {result['process_ms']:>11.1f} "
+                f"{result['modules']:>8}  {', '.join(result['network_modules']) or '-'}"
+            )
+            previous = (baseline or {}).get('startup', {}).get(name)
+            if previous:
+                lines.append(
+                    f"{'  vs baseline':<14} {'':<18} {_delta(result['import_ms'], previous['import_ms']):>10} "
+                    f"{_delta(result['process_ms'], previous['process_ms']):>11} "
+                    f"{result['modules'] - previous['modules']:>+8}"
+                )
+    # Runs with different corpora or worker counts are not comparable; repeat
+    # counts are, and so are the two analysis backends
+    comparable_keys = ('scale', 'seed', 'jobs', 'corpus_version')
+    previous_settings = (baseline or {}).get('settings', {})
+    if baseline and any(previous_settings.get(key) != run['settings'][key] for key in comparable_keys):
+        lines.append("")
+        lines.append(f"Note: baseline settings differ: {previous_settings}")
+    return "\n".join(lines)
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description='Benchmarks for bug_detector.py')
+    parser.add_argument('--corpus-dir', default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                             '.bug_detector_bench'),
+                        help='Where synthetic corpora are generated and reused')
+    parser.add_argument('--corpus', action='append', choices=sorted(CORPORA), default=None,
+                        help='Corpus to run (repeatable; default: all)')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='Multiply corpus sizes by this factor')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for corpus generation')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Worker processes passed to analyze_all_files')
+    parser.add_argument('--structural', action='store_true',
+                        help='Benchmark the structural (BraceTree) analysis backend')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per corpus; the median is reported')
+    parser.add_argument('--startup-only', action='store_true',
+                        help='Only run the -X importtime startup benchmark')
+    parser.add_argument('--output', default=None, help='Write this run as JSON')
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE_FILE, default=None,
+                        metavar='PATH', help='Store this run as the baseline')
+    parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE_FILE, default=None,
+                        metavar='PATH', help='Compare this run against a stored baseline')
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    names = [] if args.startup_only else args.corpus or list(CORPORA)
+    run = run_suite(Path(args.corpus_dir), names, args.scale, args.seed, args.jobs, args.repeat, args.structural)
+    print("Benchmarking startup ...", flush=True)
+    run['startup'] = measure_startup(max(args.repeat, 5))
+
+    baseline = None
+    if args.compare:
+        try:
+            with open(args.compare) as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not read baseline {args.compare}: {e}", file=sys.stderr)
+
+    print()
+    print(format_results(run, baseline))
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w') as f:
+                json.dump(run, f, indent=2)
+            print(f"Results saved to {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+DREAM-SVN Backend Bug Detection Tool
+====================================
+
+This comprehensive testing tool analyzes the JavaScript/Node.js microservices
+backend for potential bugs, security issues, and code quality problems.
+
+Features:
+- Static code analysis for JavaScript files
+- API endpoint testing
+- Database connection testing
+- Security vulnerability detection
+- Code quality metrics
+- Performance bottleneck detection
+- Configuration validation
+
+Importing the package has no side effects: logging is configured by the CLI
+(bugdetector.cli), and the classes that need the HTTP stack, git, ctypes or
+multiprocessing are loaded on first access.
+
+Usage: python -m bugdetector
+"""
+
+import importlib
+
+from .constants import (DETECTOR_VERSION, DEFAULT_CACHE_FILE, DEFAULT_BASELINE_FILE,
+                        DEFAULT_LARGE_FILE_THRESHOLD, LARGE_FILE_MODES, DEFAULT_PATTERN_BUDGET)
+from .findings import RuleInfo, rule_info, BugReport, Endpoint, dedup_findings, group_findings
+from .source import LineIndex, JsSourceViews, BraceTree
+from .engine import PatternScanEngine
+from .walker import ProjectWalker
+from .routes import RouteIndexer
+from .cache import ResultCache
+from .baseline import FindingBaseline
+from .profiling import ScanProfile
+from .analyzer import CodeAnalyzer
+from .config import ConfigValidator
+from .report import (SEVERITIES, ReportWriter, TextReportWriter, JsonLinesReportWriter,
+                     SarifReportWriter, REPORT_WRITERS, DEFAULT_REPORT_FILES)
+from .detector import BugDetector
+
+# Loaded on first access (PEP 562) so that importing the package stays cheap.
+# They are left out of __all__ so a star import does not load them either.
+_LAZY = {
+    'GitDiffScope': 'diff_scope',
+    'GuardedScanner': 'guard',
+    'PatternFuzzer': 'guard',
+    'LatencyHistogram': 'api',
+    'LoadStats': 'api',
+    'APITester': 'api',
+    'InotifyWatcher': 'watch',
+    'WatchSession': 'watch',
+}
+
+__all__ = [
+    'DETECTOR_VERSION', 'DEFAULT_CACHE_FILE', 'DEFAULT_BASELINE_FILE', 'DEFAULT_LARGE_FILE_THRESHOLD',
+    'LARGE_FILE_MODES', 'DEFAULT_PATTERN_BUDGET', 'RuleInfo', 'rule_info', 'BugReport', 'Endpoint',
+    'dedup_findings', 'group_findings', 'LineIndex', 'JsSourceViews', 'BraceTree', 'PatternScanEngine',
+    'ProjectWalker', 'RouteIndexer', 'ResultCache', 'FindingBaseline', 'ScanProfile', 'CodeAnalyzer',
+    'ConfigValidator', 'SEVERITIES', 'ReportWriter', 'TextReportWriter', 'JsonLinesReportWriter',
+    'SarifReportWriter', 'REPORT_WRITERS', 'DEFAULT_REPORT_FILES', 'BugDetector',
+]
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(f'.{_LAZY[name]}', __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,5 @@
+"""Entry point for python -m bugdetector"""
+
+from .cli import main
+
+main()
@@ -0,0 +1,742 @@
+"""Static analysis of JavaScript files"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import heapq
+import itertools
+import mmap
+import time
+import logging
+from pathlib import Path
+from typing import Dict, List, Tuple, Optional, TYPE_CHECKING
+
+from .constants import (DETECTOR_VERSION, DEFAULT_LARGE_FILE_THRESHOLD, LARGE_FILE_MODES,
+                        LARGE_FILE_SAMPLE_CHARS, FILE_CHECKS_RULE_ID, DEFAULT_PATTERN_BUDGET,
+                        NON_PLAIN_ASCII, INLINE_IGNORE_MARKER, INLINE_IGNORE, MAX_SNIPPET_CHARS)
+from .findings import RuleInfo, rule_info, BugReport, Endpoint
+from .source import LineIndex, JsSourceViews, BraceTree
+from .engine import as_bytes_pattern, add_rule_stats, PatternScanEngine
+from .walker import ProjectWalker
+from .routes import RouteIndexer
+from .cache import ResultCache
+from .profiling import ScanProfile
+
+if TYPE_CHECKING:
+    from .diff_scope import GitDiffScope
+
+logger = logging.getLogger(__name__)
+
+class CodeAnalyzer:
+    """Static code analyzer for JavaScript files"""
+
+    # Express route registration, matched in the code view by the structural backend
+    ROUTE_CALL = re.compile(r'\b(\w+)\.(?:get|post|put|delete|patch|all)\s*\(')
+    LOOP_KEYWORD = re.compile(r'\b(?:for|while|do)\b')
+    
+    def __init__(self, root_path: str, cache_path: Optional[str] = None,
+                 diff_scope: Optional['GitDiffScope'] = None, walker: Optional[ProjectWalker] = None,
+                 large_file_threshold: int = DEFAULT_LARGE_FILE_THRESHOLD,
+                 large_file_mode: str = 'stream', file_timeout: Optional[float] = None,
+                 pattern_budget: float = DEFAULT_PATTERN_BUDGET, profile: Optional['ScanProfile'] = None,
+                 structural: bool = False):
+        if large_file_mode not in LARGE_FILE_MODES:
+            raise ValueError(f"large_file_mode must be one of {LARGE_FILE_MODES}")
+        self.root_path = Path(root_path)
+        self.bugs: List[BugReport] = []
+        self.large_file_threshold = large_file_threshold
+        self.large_file_mode = large_file_mode
+        # Set file_timeout to analyze each file in a killable worker (see GuardedScanner)
+        self.file_timeout = file_timeout
+        self.pattern_budget = pattern_budget
+        self.budget_violations: List[BugReport] = []
+        # Per-rule and per-file cost accounting, collected when a ScanProfile is set
+        self.profile = profile
+        # Run the BraceTree checks in place of the brace-matching regexes
+        self.structural = structural
+        # RouteIndexer output for the files of the last analyze_all_files run
+        self.route_indexes: Dict[str, Dict] = {}
+        self.endpoints: List[Endpoint] = []
+        self.walker = walker or ProjectWalker(root_path)
+        self.cache = ResultCache(cache_path) if cache_path else None
+        self.diff_scope = diff_scope
+        
+        # Common bug patterns
+        self.patterns = {
+            'sql_injection': [
+                r'query\s*\(\s*["`\'].*\$\{.*\}.*["`\']',  # Template literals in SQL
+                r'query\s*\(\s*["`\'].*\+.*["`\']',        # String concatenation in SQL
+                r'sequelize\.query\s*\(\s*["`\'].*\$\{.*\}.*["`\']'
+            ],
+            'xss_vulnerability': [
+                r'innerHTML\s*=\s*.*\+',                   # innerHTML with concatenation
+                r'document\.write\s*\(',                   # document.write usage
+                r'eval\s*\(',                              # eval usage
+                r'dangerouslySetInnerHTML'                 # React XSS risk
+            ],
+            'hardcoded_secrets': [
+                r'password\s*[:=]\s*["\'][^"\']{8,}["\']', # Hardcoded passwords
+                r'api[_-]?key\s*[:=]\s*["\'][^"\']{16,}["\']', # API keys
+                r'secret\s*[:=]\s*["\'][^"\']{16,}["\']',  # Secrets
+                r'token\s*[:=]\s*["\'][^"\']{32,}["\']'    # Tokens
+            ],
+            'async_issues': [
+                r'await\s+(?!.*catch).*\n(?!.*catch)',     # Await without try-catch
+                r'Promise\.(?:resolve|reject)\s*\([^)]*\)\s*(?!\.catch)', # Unhandled promises
+                r'setTimeout\s*\(\s*async\s+function',     # Async in setTimeout
+            ],
+            'memory_leaks': [
+                r'setInterval\s*\([^}]*\)\s*(?!.*clearInterval)', # Uncleaned intervals
+                r'addEventListener\s*\([^}]*\)\s*(?!.*removeEventListener)', # Uncleaned listeners
+                r'new\s+Array\s*\(\s*\d{6,}\s*\)',        # Large array allocations
+            ],
+            'error_handling': [
+                r'catch\s*\(\s*\w+\s*\)\s*\{\s*\}',       # Empty catch blocks
+                r'catch\s*\(\s*\w+\s*\)\s*\{\s*console\.log', # Only console.log in catch
+                r'throw\s+new\s+Error\s*\(\s*["\']["\']',  # Empty error messages
+            ],
+            'performance_issues': [
+                r'for\s*\([^}]*\)\s*\{[^}]*for\s*\([^}]*\)\s*\{[^}]*for', # Nested loops (3+ levels)
+                r'JSON\.parse\s*\(\s*JSON\.stringify',     # Inefficient deep copy
+                r'\.map\s*\([^}]*\)\.filter\s*\(',         # Inefficient chaining
+            ],
+            'logic_errors': [
+                r'if\s*\(\s*\w+\s*=\s*\w+\s*\)',         # Assignment in if condition
+                r'==\s*true\s*\|\|\s*==\s*false',         # Redundant boolean comparison
+                r'return\s+.*\?\s*true\s*:\s*false',      # Redundant ternary
+            ],
+            'config_issues': [
+                r'process\.env\.\w+\s*\|\|\s*["\'][^"\']*["\']', # Default values for env vars
+                r'PORT\s*=\s*\d+',                        # Hardcoded ports
+                r'localhost:\d+',                         # Hardcoded localhost URLs
+            ]
+        }
+
+        # Per-category finding metadata
+        self.severity_map = {
+            'sql_injection': 'critical',
+            'xss_vulnerability': 'critical',
+            'hardcoded_secrets': 'high',
+            'async_issues': 'high',
+            'memory_leaks': 'medium',
+            'error_handling': 'medium',
+            'performance_issues': 'medium',
+            'logic_errors': 'high',
+            'config_issues': 'low'
+        }
+
+        self.description_map = {
+            'sql_injection': 'Potential SQL injection vulnerability detected',
+            'xss_vulnerability': 'Potential XSS vulnerability detected',
+            'hardcoded_secrets': 'Hardcoded secret or credential detected',
+            'async_issues': 'Async/await error handling issue',
+            'memory_leaks': 'Potential memory leak detected',
+            'error_handling': 'Poor error handling detected',
+            'performance_issues': 'Performance bottleneck detected',
+            'logic_errors': 'Logic error detected',
+            'config_issues': 'Configuration issue detected'
+        }
+
+        self.recommendation_map = {
+            'sql_injection': 'Use parameterized queries or prepared statements',
+            'xss_vulnerability': 'Sanitize user input and use safe DOM manipulation',
+            'hardcoded_secrets': 'Move secrets to environment variables',
+            'async_issues': 'Add proper try-catch blocks around await statements',
+            'memory_leaks': 'Ensure proper cleanup of intervals and event listeners',
+            'error_handling': 'Implement proper error handling and logging',
+            'performance_issues': 'Optimize algorithm or use more efficient approaches',
+            'logic_errors': 'Review logic and fix conditional statements',
+            'config_issues': 'Use environment variables for configuration'
+        }
+
+        # JsSourceViews scope of each category or rule id; unlisted rules use
+        # PatternScanEngine.DEFAULT_SCOPE and see everything but comments
+        self.rule_scopes = {
+            'hardcoded_secrets': 'raw',  # a commented-out secret is still leaked
+            'xss_vulnerability': 'code',
+            'async_issues': 'code',
+            'memory_leaks': 'code',
+            'error_handling': 'code',
+            'performance_issues': 'code',
+            'logic_errors': 'code',
+            'config_issues': 'code',
+            'config_issues[2]': 'strings',  # localhost URLs
+        }
+
+        # Regex rules replaced by a BraceTree check (a CodeAnalyzer method)
+        # when the structural backend is on
+        self.structural_rules = {
+            'performance_issues[0]': '_check_loop_nesting',
+        }
+        self.loop_nest_depth = 3
+
+        self.route_pattern = re.compile(
+            r'app\.(get|post|put|delete|patch)\s*\([^,]+,\s*(?:async\s+)?\([^)]*\)\s*=>\s*\{[^}]*\}',
+            re.DOTALL
+        )
+        self.scan_engine = PatternScanEngine(self.patterns, self.rule_scopes)
+        self.rebuild_rule_table()
+
+    def rebuild_scan_engine(self):
+        """Recompile the scan engine after self.patterns or self.rule_scopes has been modified"""
+        self.scan_engine = PatternScanEngine(self.patterns, self.rule_scopes)
+        self.rebuild_rule_table()
+
+    def rebuild_rule_table(self):
+        """Build the shared RuleInfo of each pattern category from the metadata maps"""
+        self.rule_table = {category: self._rule_for(category) for category in self.patterns}
+
+    def _rule_for(self, category: str) -> RuleInfo:
+        return rule_info(
+            self.severity_map.get(category, 'medium'),
+            category,
+            self.description_map.get(category, 'Issue detected'),
+            self.recommendation_map.get(category, 'Review and fix'),
+        )
+
+    def _ensure_scan_engine(self):
+        """Rebuild the scan engine if self.patterns changed since it was compiled,
+        and the rule table in case the metadata maps changed"""
+        if self.scan_engine.source != self.patterns or self.scan_engine.scopes != self.rule_scopes:
+            self.rebuild_scan_engine()
+        else:
+            self.rebuild_rule_table()
+
+    def fingerprint(self) -> str:
+        """Return a digest of everything that determines the analysis output"""
+        rule_set = {
+            'version': DETECTOR_VERSION,
+            'analyzer': type(self).__qualname__,
+            'patterns': self.patterns,
+            'rule_scopes': self.rule_scopes,
+            'tokenizer': JsSourceViews.patterns(),
+            'severity_map': self.severity_map,
+            'description_map': self.description_map,
+            'recommendation_map': self.recommendation_map,
+            'route_pattern': self.route_pattern.pattern,
+            'route_index': RouteIndexer.patterns(),
+            'inline_ignore': INLINE_IGNORE.pattern,
+            'large_files': [self.large_file_threshold, self.large_file_mode],
+            'structural': [self.structural, self.structural_rules, self.loop_nest_depth,
+                           BraceTree.BRACE.pattern] if self.structural else False,
+        }
+        return hashlib.sha256(json.dumps(rule_set, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def analyze_file(self, file_path: Path, skip_rules: frozenset = frozenset(),
+                     rule_stats: Optional[Dict[str, List[float]]] = None,
+                     route_index: Optional[Dict] = None) -> List[BugReport]:
+        """Analyze a single JavaScript file for bugs
+
+        skip_rules and rule_stats are passed to PatternScanEngine.scan; the
+        file-specific checks are skipped and measured as FILE_CHECKS_RULE_ID.
+        If route_index is given, it is filled with the file's RouteIndexer index.
+        """
+        bugs = []
+        
+        try:
+            size = os.path.getsize(file_path)
+            if size >= self.large_file_threshold > 0:
+                return self._analyze_large_file(file_path, size, skip_rules, rule_stats, route_index)
+
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+
+            self._analyze_content(file_path, content, bugs, skip_rules, rule_stats, route_index)
+            
+        except Exception as e:
+            logger.error(f"Error analyzing {file_path}: {e}")
+            
+        return bugs
+
+    def _analyze_content(self, file_path: Path, content, bugs: List[BugReport],
+                         skip_rules: frozenset = frozenset(),
+                         rule_stats: Optional[Dict[str, List[float]]] = None,
+                         route_index: Optional[Dict] = None):
+        """Run all checks over content, appending findings to bugs
+
+        Pattern rules and the route index see the JsSourceViews view of their
+        scope; inline suppressions are read from its comments, and snippets and
+        the file-specific checks use the content as read.
+        """
+        line_index = LineIndex(content)
+        views = JsSourceViews(content)
+        if route_index is not None:
+            route_index.update(RouteIndexer.index(views.text('all'), line_index))
+        path = sys.intern(str(file_path))
+        # Findings on the same short line share one snippet string; long lines
+        # get a window around each match (see LineIndex.snippet)
+        snippets: Dict[int, str] = {}
+        suppressions = self._inline_suppressions(views, line_index)
+
+        structural = self.structural and isinstance(content, str)
+        pattern_skips = skip_rules.union(self.structural_rules) if structural else skip_rules
+
+        # Check each pattern category
+        for category, match in self.scan_engine.scan(content, pattern_skips, rule_stats, views):
+            line_num, column, end_line = line_index.span(match.start(), match.end())
+            if suppressions and self._suppressed(suppressions, category, line_num):
+                continue
+            line_content = snippets.get(line_num)
+            if line_content is None:
+                line_content = line_index.snippet(line_num, column)
+                if line_index.line_length(line_num) <= MAX_SNIPPET_CHARS:
+                    snippets[line_num] = line_content
+
+            bug = self._create_bug_report(
+                category, path, line_num, line_content, match.group(),
+                column=column, end_line=end_line
+            )
+            if bug:
+                bugs.append(bug)
+
+        # Structural checks, timed under the rule they replace; the first one
+        # to run also pays for building the file's BraceTree
+        if structural:
+            for rule_id, check in self.structural_rules.items():
+                if rule_id in skip_rules:
+                    continue
+                start = time.perf_counter()
+                found = [bug for bug in getattr(self, check)(path, views, line_index)
+                         if not (suppressions and self._suppressed(suppressions, bug.category, bug.line_number))]
+                if rule_stats is not None:
+                    add_rule_stats(rule_stats, rule_id, time.perf_counter() - start, len(found), len(content))
+                bugs.extend(found)
+
+        # Additional file-specific checks
+        if FILE_CHECKS_RULE_ID in skip_rules:
+            return
+        start = time.perf_counter()
+        file_bugs = self._check_file_specific_issues(file_path, content, line_index,
+                                                     views if structural else None)
+        if rule_stats is not None:
+            add_rule_stats(rule_stats, FILE_CHECKS_RULE_ID, time.perf_counter() - start,
+                           len(file_bugs), len(content))
+        if suppressions:
+            file_bugs = [bug for bug in file_bugs
+                         if not self._suppressed(suppressions, bug.category, bug.line_number)]
+        bugs.extend(file_bugs)
+
+    def _check_loop_nesting(self, file_path: str, views: JsSourceViews,
+                            line_index: LineIndex) -> List[BugReport]:
+        """Report each nest of loop_nest_depth or more for/while/do loops at its outermost loop"""
+        bugs = []
+        # A file with fewer loop keywords than the depth needs no tree
+        keywords = self.LOOP_KEYWORD.finditer(views.text('code'))
+        if sum(1 for _ in itertools.islice(keywords, self.loop_nest_depth)) < self.loop_nest_depth:
+            return bugs
+        for loop in views.tree().loop_nests(self.loop_nest_depth):
+            line_num, column, end_line = line_index.span(loop.header, loop.end)
+            bugs.append(self._create_bug_report(
+                'performance_issues', file_path, line_num, line_index.snippet(line_num, column), '',
+                column=column, end_line=end_line
+            ))
+        return bugs
+
+    @staticmethod
+    def _inline_suppressions(views: JsSourceViews, line_index: LineIndex) -> Dict[int, frozenset]:
+        """Return {line: suppressed categories} for bugdetector-ignore comments
+
+        A comment covers the line it starts on. A comment with nothing else
+        on its lines also covers the line below it. An empty set suppresses
+        every category on the line.
+        """
+        content = views.content
+        if views.is_text:
+            marker, pattern = INLINE_IGNORE_MARKER, INLINE_IGNORE
+        else:
+            marker, pattern = INLINE_IGNORE_MARKER.encode('ascii'), as_bytes_pattern(INLINE_IGNORE)
+        if content.find(marker) == -1:
+            return {}
+
+        suppressions: Dict[int, frozenset] = {}
+        for start, end in views.spans()[0]:
+            match = pattern.match(content, start, end)
+            if match is None:
+                continue
+            categories = match.group(1) if views.is_text else match.group(1).decode('ascii')
+            categories = frozenset(re.split(r'[\s,]+', categories.strip())) - {''}
+            line, last_line = line_index.line_of(start), line_index.line_of(end - 1)
+            line_start = line_index.line_starts[line - 1]
+            line_end = line_index.line_starts[last_line] - 1 if last_line < len(line_index) else len(content)
+            alone = not content[line_start:start].strip() and not content[end:line_end].strip()
+            for covered in (line, last_line + 1) if alone else (line,):
+                known = suppressions.get(covered)
+                # Either set being empty means every category
+                suppressions[covered] = categories if known is None else (known and categories and known | categories)
+        return suppressions
+
+    @staticmethod
+    def _suppressed(suppressions: Dict[int, frozenset], category: str, line: int) -> bool:
+        """Whether a bugdetector-ignore comment covers category on this line"""
+        categories = suppressions.get(line)
+        return categories is not None and (not categories or category in categories)
+
+    def scan_file(self, file_path: Path, skip_rules: frozenset = frozenset(),
+                  profiling: bool = False) -> Tuple[List[BugReport], Dict, Optional[Tuple]]:
+        """Analyze a file and return (bugs, route index, profile record)
+
+        The profile record is (seconds, bytes, rule_stats) for ScanProfile when
+        profiling, and None otherwise.
+        """
+        route_index: Dict = {}
+        if not profiling:
+            return self.analyze_file(file_path, skip_rules, route_index=route_index), route_index, None
+
+        rule_stats: Dict[str, List[float]] = {}
+        start = time.perf_counter()
+        bugs = self.analyze_file(file_path, skip_rules, rule_stats, route_index)
+        seconds = time.perf_counter() - start
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            size = 0
+        return bugs, route_index, (seconds, size, rule_stats)
+
+    def probe_rule(self, file_path: Path, rule_id: str) -> float:
+        """Run a single rule over a file and return the time it took in seconds"""
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            content = f.read()
+
+        start = time.perf_counter()
+        if rule_id == FILE_CHECKS_RULE_ID:
+            self._check_file_specific_issues(file_path, content)
+        else:
+            engine = self.scan_engine
+            views = JsSourceViews(content)
+            if self.structural and rule_id in self.structural_rules:
+                getattr(self, self.structural_rules[rule_id])(str(file_path), views, LineIndex(content))
+            else:
+                scope = engine.rule_scopes[engine.rule_ids.index(rule_id)]
+                for _ in engine.rule(rule_id).finditer(views.text(scope)):
+                    pass
+        return time.perf_counter() - start
+
+    def all_rule_ids(self) -> List[str]:
+        """Return the ids of all rules, including the file-specific checks"""
+        return self.scan_engine.rule_ids + [FILE_CHECKS_RULE_ID]
+
+    def _analyze_large_file(self, file_path: Path, size: int, skip_rules: frozenset = frozenset(),
+                            rule_stats: Optional[Dict[str, List[float]]] = None,
+                            route_index: Optional[Dict] = None) -> List[BugReport]:
+        """Analyze a file at or above large_file_threshold according to large_file_mode
+
+        'skip' ignores the file, 'sample' scans only its first
+        LARGE_FILE_SAMPLE_CHARS characters, and 'stream' scans all of it. A
+        streamed file that is plain ASCII without carriage returns or \\x1c-\\x1f
+        separators is memory-mapped and matched with bytes patterns, which
+        behave exactly like the str patterns on such input, against bytes
+        JsSourceViews. Anything else, and every file when the structural
+        backend is on (its BraceTree works on str), is decoded as usual.
+        Neither path builds a list of lines, and both give the findings a
+        small file with the same content would.
+        """
+        bugs: List[BugReport] = []
+
+        if self.large_file_mode == 'skip':
+            logger.warning(f"Skipping large file ({size} bytes): {file_path}")
+            return bugs
+
+        if self.large_file_mode == 'sample':
+            logger.warning(f"Sampling first {LARGE_FILE_SAMPLE_CHARS} characters of large file ({size} bytes): {file_path}")
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                content = f.read(LARGE_FILE_SAMPLE_CHARS)
+            if len(content) == LARGE_FILE_SAMPLE_CHARS and '\n' in content:
+                content = content[:content.rindex('\n') + 1]
+            self._analyze_content(file_path, content, bugs, skip_rules, rule_stats, route_index)
+            return bugs
+
+        logger.info(f"Streaming large file ({size} bytes): {file_path}")
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            if not self.structural and NON_PLAIN_ASCII.search(buffer) is None:
+                self._analyze_content(file_path, buffer, bugs, skip_rules, rule_stats, route_index)
+                return bugs
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            self._analyze_content(file_path, f.read(), bugs, skip_rules, rule_stats, route_index)
+        return bugs
+
+    def _create_bug_report(self, category: str, file_path: Path, line_num: int, 
+                          line_content: str, match: str, column: int = 0,
+                          end_line: int = 0) -> Optional[BugReport]:
+        """Create a bug report based on the detected pattern"""
+        rule = self.rule_table.get(category) or self._rule_for(category)
+        return BugReport.from_rule(
+            rule,
+            sys.intern(str(file_path)),
+            line_num,
+            code_snippet=line_content.strip(),
+            column_number=column,
+            end_line_number=end_line or line_num
+        )
+
+    def _check_file_specific_issues(self, file_path: Path, content,
+                                    line_index: Optional[LineIndex] = None,
+                                    views: Optional[JsSourceViews] = None) -> List[BugReport]:
+        """Check for file-specific issues
+
+        content is a str or an ASCII bytes-like buffer, as for PatternScanEngine.scan.
+        Given the views of a str content, route handlers are checked on its
+        BraceTree instead of with route_pattern.
+        """
+        bugs = []
+        if line_index is None:
+            line_index = LineIndex(content)
+        if views is not None:
+            bugs.extend(self._check_route_handlers(file_path, content, views, line_index))
+
+        if isinstance(content, str):
+            contains = content.__contains__
+            route_pattern = self.route_pattern
+        else:
+            contains = lambda text: content.find(text.encode('ascii')) != -1
+            route_pattern = as_bytes_pattern(self.route_pattern)
+        
+        # Check for missing error handling in Express routes
+        if views is None and contains('express') and contains('app.'):
+            routes = route_pattern.finditer(content)
+            
+            for route in routes:
+                route_content = route.group()
+                if not isinstance(route_content, str):
+                    route_content = route_content.decode('ascii')
+                if 'try' not in route_content and 'catch' not in route_content:
+                    line_num, column, end_line = line_index.span(route.start(), route.end())
+                    bugs.append(BugReport(
+                        severity='medium',
+                        category='error_handling',
+                        file_path=str(file_path),
+                        line_number=line_num,
+                        description='Express route missing error handling',
+                        recommendation='Add try-catch blocks to handle errors properly',
+                        code_snippet=route_content[:100] + '...',
+                        column_number=column,
+                        end_line_number=end_line
+                    ))
+        
+        # Check for missing input validation
+        if contains('req.body') or contains('req.params') or contains('req.query'):
+            validation_keywords = ['validate', 'joi', 'yup', 'express-validator', 'check']
+            if isinstance(content, str):
+                lowered = content.lower()
+                has_validation = any(keyword in lowered for keyword in validation_keywords)
+            else:
+                has_validation = any(
+                    re.search(re.escape(keyword.encode('ascii')), content, re.IGNORECASE)
+                    for keyword in validation_keywords
+                )
+            
+            if not has_validation:
+                bugs.append(BugReport(
+                    severity='high',
+                    category='security',
+                    file_path=str(file_path),
+                    line_number=1,
+                    description='Missing input validation for user data',
+                    recommendation='Implement input validation using libraries like Joi or express-validator',
+                    code_snippet='req.body/req.params/req.query usage detected'
+                ))
+        
+        return bugs
+
+    def _check_route_handlers(self, file_path: Path, content: str, views: JsSourceViews,
+                              line_index: LineIndex) -> List[BugReport]:
+        """Report Express route handlers without a try/catch or .catch(), using the BraceTree
+
+        Covers app and every Express router of the file (see RouteIndexer), and
+        handler bodies of any shape.
+        """
+        if 'express' not in content:
+            return []
+        code = views.text('code')
+        routers = set(RouteIndexer.DEFAULT_ROUTERS)
+        routers.update(match.group(1) for match in RouteIndexer.ROUTER.finditer(code))
+
+        bugs = []
+        tree = None
+        for call in self.ROUTE_CALL.finditer(code):
+            if call.group(1) not in routers:
+                continue
+            tree = tree or views.tree()
+            handlers = tree.arguments(call.end() - 1)
+            if not handlers or tree.handles_errors(handlers[-1]):
+                continue
+            line_num, column, end_line = line_index.span(call.start(), handlers[-1].end)
+            bugs.append(BugReport(
+                severity='medium',
+                category='error_handling',
+                file_path=str(file_path),
+                line_number=line_num,
+                description='Express route missing error handling',
+                recommendation='Add try-catch blocks to handle errors properly',
+                code_snippet=content[call.start():call.start() + 100] + '...',
+                column_number=column,
+                end_line_number=end_line
+            ))
+        return bugs
+
+    def analyze_all_files(self, jobs: int = 1) -> List[BugReport]:
+        """Analyze all JavaScript files in the project
+
+        With jobs > 1 the files are analyzed in a process pool; jobs <= 0 uses
+        one worker per CPU. The result is the same for any worker count. When a
+        diff scope is set only the files it lists are analyzed. When
+        file_timeout is set, rules that overrun their time budget are recorded
+        in self.budget_violations. Express routes found along the way are
+        collected into self.endpoints.
+        """
+        all_bugs = []
+        self.budget_violations = []
+        
+        # Find all JS files
+        if self.diff_scope is not None:
+            js_files = self.diff_scope.js_files()
+        else:
+            js_files = self.walker.files('js')
+        
+        logger.info(f"Analyzing {len(js_files)} JavaScript files...")
+
+        if jobs <= 0:
+            jobs = os.cpu_count() or 1
+
+        self._ensure_scan_engine()
+        results: List[Optional[List[BugReport]]] = [None] * len(js_files)
+        digests: List[Optional[str]] = [None] * len(js_files)
+        route_indexes: List[Dict] = [{} for _ in js_files]
+
+        if self.cache:
+            self.cache.load(self.fingerprint())
+            for index, file_path in enumerate(js_files):
+                digests[index], results[index], route_indexes[index] = self.cache.lookup(file_path)
+
+        pending = [index for index, bugs in enumerate(results) if bugs is None]
+        if self.cache:
+            logger.info(f"Result cache: {len(js_files) - len(pending)} hits, {len(pending)} files to analyze")
+            if self.profile is not None:
+                self.profile.cached_files += len(js_files) - len(pending)
+
+        pending_files = [js_files[index] for index in pending]
+        violations: List[List[BugReport]] = [[] for _ in pending_files]
+        if self.file_timeout and pending_files:
+            from .guard import GuardedScanner
+            scanner = GuardedScanner(self, self.file_timeout, self.pattern_budget, workers=jobs)
+            outcomes = scanner.analyze_files(pending_files)
+            fresh = [(bugs, route_index, record) for bugs, _, route_index, record in outcomes]
+            violations = [file_violations for _, file_violations, _, _ in outcomes]
+        elif jobs > 1 and len(pending_files) > 1:
+            fresh = self._analyze_files_parallel(pending_files, jobs)
+        else:
+            fresh = []
+            for file_path in pending_files:
+                logger.info(f"Analyzing: {file_path}")
+                fresh.append(self.scan_file(file_path, profiling=self.profile is not None))
+
+        for index, (bugs, route_index, record), file_violations in zip(pending, fresh, violations):
+            results[index] = bugs
+            route_indexes[index] = route_index
+            self.budget_violations.extend(file_violations)
+            if record is not None and self.profile is not None:
+                self.profile.add_file(js_files[index], record, len(bugs))
+            # Files with budget overruns are re-analyzed next time rather than cached
+            if self.cache and digests[index] and not file_violations:
+                self.cache.store(js_files[index], digests[index], bugs, route_index)
+
+        if self.cache:
+            self.cache.save(js_files if self.diff_scope is None else None)
+
+        for bugs in results:
+            all_bugs.extend(bugs)
+
+        self.route_indexes = {str(file_path): route_index
+                              for file_path, route_index in zip(js_files, route_indexes) if route_index}
+        self.endpoints = RouteIndexer.catalogue(self.route_indexes)
+        if self.endpoints:
+            logger.info(f"Indexed {len(self.endpoints)} Express endpoints")
+
+        if self.diff_scope is not None and self.diff_scope.changed_lines_only:
+            all_bugs = [bug for bug in all_bugs if self.diff_scope.covers(bug)]
+        
+        self.bugs = all_bugs
+        return all_bugs
+
+    def _rule_tables(self) -> Dict[str, Dict]:
+        """Return the rule tables a worker process needs to reproduce this analyzer"""
+        return {
+            'patterns': self.patterns,
+            'rule_scopes': self.rule_scopes,
+            'severity_map': self.severity_map,
+            'description_map': self.description_map,
+            'recommendation_map': self.recommendation_map,
+            'large_file_threshold': self.large_file_threshold,
+            'large_file_mode': self.large_file_mode,
+            'pattern_budget': self.pattern_budget,
+            'structural': self.structural,
+            'structural_rules': self.structural_rules,
+            'loop_nest_depth': self.loop_nest_depth,
+        }
+
+    def _analyze_files_parallel(self, js_files: List[Path], jobs: int) -> List[Tuple[List[BugReport], Dict, Optional[Tuple]]]:
+        """Analyze files in a process pool, returning scan_file results in input order"""
+        chunks = _balanced_chunks(js_files, jobs * 4)
+        results: List[Tuple[List[BugReport], Dict, Optional[Tuple]]] = [([], {}, None) for _ in js_files]
+        profiling = self.profile is not None
+
+        # Imported here: the pool machinery costs startup time that serial runs never need
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_analyzer_worker,
+            initargs=(type(self), str(self.root_path), self._rule_tables())
+        ) as executor:
+            for chunk_results in executor.map(_analyze_chunk, chunks, [profiling] * len(chunks)):
+                for index, *result in chunk_results:
+                    results[index] = tuple(result)
+                logger.info(f"Analyzed chunk of {len(chunk_results)} files")
+
+        return results
+
+
+# Per-process analyzer used by the parallel mode of CodeAnalyzer.analyze_all_files
+_worker_analyzer: Optional[CodeAnalyzer] = None
+
+def _init_analyzer_worker(analyzer_cls, root_path: str, rule_tables: Dict[str, Dict]) -> CodeAnalyzer:
+    """Build the worker's analyzer and compile its pattern table once"""
+    global _worker_analyzer
+    _worker_analyzer = analyzer_cls(root_path)
+    for name, table in rule_tables.items():
+        setattr(_worker_analyzer, name, table)
+    _worker_analyzer.rebuild_scan_engine()
+    return _worker_analyzer
+
+def _analyze_chunk(chunk: List[Tuple[int, str]], profiling: bool = False) -> List[Tuple]:
+    """Analyze a chunk of (index, path) pairs in a worker process
+
+    Returns (index, bugs, route index, profile record) tuples; see CodeAnalyzer.scan_file.
+    """
+    return [(index, *_worker_analyzer.scan_file(Path(path), profiling=profiling)) for index, path in chunk]
+
+def _balanced_chunks(files: List[Path], count: int) -> List[List[Tuple[int, str]]]:
+    """Split files into at most count chunks of roughly equal total size
+
+    Files are assigned largest first to the currently lightest chunk, so one
+    huge bundle does not end up queued behind a full chunk of other work.
+    """
+    sized = []
+    for index, file_path in enumerate(files):
+        try:
+            size = file_path.stat().st_size
+        except OSError:
+            size = 0
+        sized.append((size, index, str(file_path)))
+    sized.sort(key=lambda item: (-item[0], item[1]))
+
+    count = max(1, min(count, len(files)))
+    chunks: List[List[Tuple[int, str]]] = [[] for _ in range(count)]
+    heap = [(0, i) for i in range(count)]
+    for size, index, path in sized:
+        total, chunk_id = heapq.heappop(heap)
+        chunks[chunk_id].append((index, path))
+        heapq.heappush(heap, (total + size, chunk_id))
+
+    return [chunk for chunk in chunks if chunk]
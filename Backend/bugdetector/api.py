@@ -0,0 +1,350 @@
+"""Endpoint probing and load testing against running services"""
+
+import re
+import asyncio
+import time
+import math
+import aiohttp
+import logging
+from typing import Dict, List, Tuple, Optional
+from urllib.parse import urljoin, urlparse
+
+from .findings import BugReport, Endpoint
+
+logger = logging.getLogger(__name__)
+
+class LatencyHistogram:
+    """Streaming latency histogram with bounded relative error.
+
+    Samples are counted in logarithmic buckets, so every percentile is within
+    `precision` of the true value while memory stays at a few hundred counters
+    however many samples are added. min, max and mean are exact.
+    """
+
+    def __init__(self, precision: float = 0.01, min_value: float = 1e-6):
+        self.gamma = (1 + precision) / (1 - precision)
+        self.log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, value: float):
+        key = math.ceil(math.log(max(value, self.min_value)) / self.log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: 'LatencyHistogram'):
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> float:
+        """Return the value at quantile q (0..1), or 0.0 if nothing was recorded"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen >= rank:
+                estimate = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+class LoadStats:
+    """Latency, throughput and error counts for one endpoint under load"""
+
+    def __init__(self, method: str, url: str):
+        self.method = method
+        self.url = url
+        self.latency = LatencyHistogram()
+        self.requests = 0
+        self.errors = 0
+        self.statuses: Dict[str, int] = {}
+        # Ticks skipped in rate mode because the concurrency limit was reached
+        self.dropped = 0
+        self.unreachable = False
+        self.elapsed = 0.0
+
+    def record(self, seconds: float, status: Optional[int]):
+        """Record one request; status is None for connection errors and timeouts"""
+        self.requests += 1
+        self.latency.add(seconds)
+        label = f"{status // 100}xx" if status is not None else 'failed'
+        self.statuses[label] = self.statuses.get(label, 0) + 1
+        if status is None or status >= 500:
+            self.errors += 1
+
+    def summary(self) -> Dict:
+        return {
+            'method': self.method,
+            'url': self.url,
+            'requests': self.requests,
+            'throughput': self.requests / self.elapsed if self.elapsed else 0.0,
+            'error_rate': self.errors / self.requests if self.requests else 0.0,
+            'p50': self.latency.percentile(0.50),
+            'p95': self.latency.percentile(0.95),
+            'p99': self.latency.percentile(0.99),
+            'max': self.latency.max,
+            'mean': self.latency.mean,
+            'statuses': dict(sorted(self.statuses.items())),
+            'dropped': self.dropped,
+            'unreachable': self.unreachable,
+        }
+
+    def format_line(self) -> str:
+        summary = self.summary()
+        ms = {key: summary[key] * 1000 for key in ('p50', 'p95', 'p99', 'max')}
+        line = (f"{summary['requests']} requests, {summary['throughput']:.1f} req/s, "
+                f"{summary['error_rate']:.1%} errors, p50 {ms['p50']:.1f}ms, p95 {ms['p95']:.1f}ms, "
+                f"p99 {ms['p99']:.1f}ms, max {ms['max']:.1f}ms")
+        if self.dropped:
+            line += f", {self.dropped} ticks dropped"
+        if self.unreachable:
+            line += ", host unreachable"
+        return line
+
+class APITester:
+    """Test API endpoints for common issues
+
+    All probes run concurrently over one pooled session. Each host gets a
+    semaphore of per_host_limit, requests time out after connect_timeout and
+    read_timeout, and failed connections and gateway errors are retried with
+    exponential backoff. A host that refuses connections is skipped for its
+    remaining probes.
+
+    With a catalogue of endpoints from RouteIndexer, catalogued routes are
+    probed instead of the fixed ENDPOINTS list, and findings point at the
+    file and line that define the route.
+
+    Probes send injection payloads, so by default only SAFE_METHODS are
+    used: SQL payloads go in the query string and catalogued routes with
+    other methods are skipped. With unsafe_methods, SQL payloads are POSTed
+    to the fixed endpoints and every catalogued route is probed with its own
+    method, which can create, change or delete data on the target.
+    """
+
+    ENDPOINTS = ['/api/auth/login', '/api/users', '/api/disputes', '/health', '/']
+    SQL_PAYLOADS = ["'; DROP TABLE users; --", "1' OR '1'='1", "admin'--"]
+    XSS_PAYLOADS = ["<script>alert('xss')</script>", "javascript:alert('xss')", "<img src=x onerror=alert('xss')>"]
+    RETRY_STATUSES = frozenset({502, 503, 504})
+    BODY_METHODS = frozenset({'POST', 'PUT', 'PATCH'})
+    SAFE_METHODS = frozenset({'GET', 'HEAD'})
+    PATH_PARAM = re.compile(r':\w+\??')
+
+    def __init__(self, base_urls: List[str], endpoints: Optional[List[str]] = None,
+                 per_host_limit: int = 8, connect_timeout: float = 3.0, read_timeout: float = 10.0,
+                 retries: int = 2, backoff: float = 0.25, pool_size: int = 100,
+                 catalogue: Optional[List[Endpoint]] = None, unsafe_methods: bool = False):
+        self.base_urls = base_urls
+        self.endpoints = endpoints or self.ENDPOINTS
+        self.catalogue = catalogue or []
+        self.per_host_limit = per_host_limit
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.pool_size = pool_size
+        self.unsafe_methods = unsafe_methods
+        self.bugs: List[BugReport] = []
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._unreachable: set = set()
+
+    def _probes(self) -> List[Tuple[str, str, str, str, Optional[Endpoint]]]:
+        """Return (kind, method, url, payload, endpoint) for every probe, in report order"""
+        probes = []
+        skipped = 0
+        for base_url in self.base_urls:
+            if not self.catalogue:
+                sql_method = 'POST' if self.unsafe_methods else 'GET'
+                for endpoint in self.endpoints:
+                    url = urljoin(base_url, endpoint)
+                    probes.extend(('sql', sql_method, url, payload, None) for payload in self.SQL_PAYLOADS)
+                    probes.extend(('xss', 'GET', url, payload, None) for payload in self.XSS_PAYLOADS)
+                continue
+
+            for endpoint in self.catalogue:
+                if endpoint.method == 'ALL':
+                    method = 'POST' if self.unsafe_methods else 'GET'
+                else:
+                    method = endpoint.method
+                if method not in self.SAFE_METHODS and not self.unsafe_methods:
+                    skipped += 1
+                    continue
+                url = urljoin(base_url, self.PATH_PARAM.sub('1', endpoint.path))
+                probes.extend(('sql', method, url, payload, endpoint) for payload in self.SQL_PAYLOADS)
+                if endpoint.method in ('GET', 'ALL'):
+                    probes.extend(('xss', 'GET', url, payload, endpoint) for payload in self.XSS_PAYLOADS)
+        if skipped:
+            logger.info(f"Skipped {skipped} catalogued routes whose methods can change data "
+                        f"(enable unsafe methods to probe them)")
+        return probes
+
+    def _session(self, limit: int, limit_per_host: int) -> aiohttp.ClientSession:
+        """Return a pooled keep-alive session with this tester's timeouts"""
+        connector = aiohttp.TCPConnector(limit=limit, limit_per_host=limit_per_host,
+                                         keepalive_timeout=30, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=self.connect_timeout + self.read_timeout,
+                                        sock_connect=self.connect_timeout,
+                                        sock_read=self.read_timeout)
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    def _send(self, session: aiohttp.ClientSession, kind: str, method: str, url: str, payload: str):
+        if kind == 'sql' and method in self.BODY_METHODS:
+            return session.request(method, url, json={'username': payload, 'password': 'test'})
+        return session.request(method, url, params={'q': payload})
+
+    async def _request(self, session: aiohttp.ClientSession, kind: str, method: str, url: str,
+                       payload: str) -> Optional[Tuple[int, str, str]]:
+        """Send one probe, retrying transient failures; return (status, content type, body)"""
+        host = urlparse(url).netloc
+        limit = self._host_limits.setdefault(host, asyncio.Semaphore(self.per_host_limit))
+        for attempt in range(self.retries + 1):
+            if host in self._unreachable:
+                return None
+            try:
+                async with limit:
+                    async with self._send(session, kind, method, url, payload) as resp:
+                        text = await resp.text() if kind == 'xss' else ''
+                        if resp.status not in self.RETRY_STATUSES or attempt == self.retries:
+                            return resp.status, resp.headers.get('content-type', ''), text
+            except aiohttp.ClientConnectorError as e:
+                if attempt == self.retries:
+                    self._unreachable.add(host)
+                    logger.debug(f"Giving up on {host}: {e}")
+                    return None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.debug(f"Error testing {url} (attempt {attempt + 1}): {e!r}")
+                if attempt == self.retries:
+                    return None
+            await asyncio.sleep(self.backoff * (2 ** attempt))
+        return None
+
+    async def _probe(self, session: aiohttp.ClientSession, kind: str, method: str, url: str,
+                     payload: str, endpoint: Optional[Endpoint]) -> Optional[BugReport]:
+        response = await self._request(session, kind, method, url, payload)
+        if response is None:
+            return None
+        status, content_type, text = response
+
+        # Catalogued endpoints are reported at the route definition
+        if endpoint is not None:
+            location = {'file_path': endpoint.file_path, 'line_number': endpoint.line_number}
+            target = f'{method} {url}'
+        else:
+            location = {'file_path': url, 'line_number': 0}
+            target = url
+
+        if kind == 'sql' and status == 500:
+            return BugReport(
+                severity='critical',
+                category='security',
+                description=f'Potential SQL injection vulnerability at {target}',
+                recommendation='Implement proper input sanitization and parameterized queries',
+                code_snippet=f'Payload: {payload}',
+                **location
+            )
+        if kind == 'xss' and payload in text and 'text/html' in content_type:
+            return BugReport(
+                severity='high',
+                category='security',
+                description=f'Potential XSS vulnerability at {target}',
+                recommendation='Implement proper output encoding and CSP headers',
+                code_snippet=f'Payload: {payload}',
+                **location
+            )
+        return None
+
+    async def test_endpoints(self) -> List[BugReport]:
+        """Test API endpoints for common vulnerabilities"""
+        self._host_limits = {}
+        self._unreachable = set()
+        async with self._session(self.pool_size, self.per_host_limit) as session:
+            results = await asyncio.gather(*(
+                self._probe(session, *probe) for probe in self._probes()
+            ))
+
+        if self._unreachable:
+            logger.info(f"API testing skipped unreachable hosts: {', '.join(sorted(self._unreachable))}")
+        bugs = [bug for bug in results if bug is not None]
+        self.bugs = bugs
+        return bugs
+
+    async def _load_endpoint(self, session: aiohttp.ClientSession, stats: LoadStats, deadline: float,
+                             rate: Optional[float], concurrency: int):
+        """Drive one endpoint until deadline at a fixed rate or with a fixed number of workers"""
+        async def request():
+            start = time.perf_counter()
+            try:
+                async with session.request(stats.method, stats.url) as resp:
+                    await resp.read()
+                    stats.record(time.perf_counter() - start, resp.status)
+            except aiohttp.ClientConnectorError:
+                stats.record(time.perf_counter() - start, None)
+                stats.unreachable = True
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                stats.record(time.perf_counter() - start, None)
+
+        began = time.perf_counter()
+        if rate is None:
+            async def worker():
+                while time.perf_counter() < deadline and not stats.unreachable:
+                    await request()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        else:
+            in_flight: set = set()
+            interval = 1.0 / rate
+            next_tick = began
+            while next_tick < deadline and not stats.unreachable:
+                delay = next_tick - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if len(in_flight) >= concurrency:
+                    stats.dropped += 1
+                else:
+                    task = asyncio.ensure_future(request())
+                    in_flight.add(task)
+                    task.add_done_callback(in_flight.discard)
+                next_tick += interval
+            if in_flight:
+                await asyncio.gather(*in_flight)
+        stats.elapsed = time.perf_counter() - began
+
+    async def load_test(self, targets: List[Tuple[str, str]], duration: float = 10.0,
+                        rate: Optional[float] = None, concurrency: int = 10) -> List[LoadStats]:
+        """Put each (method, path) target under load on every base URL for duration seconds
+
+        With rate set, each endpoint gets that many requests per second, with
+        at most concurrency in flight; ticks that find the limit reached are
+        counted as dropped. Without rate, concurrency workers per endpoint send
+        requests back to back. An endpoint whose host refuses connections stops early.
+        Targets with methods outside SAFE_METHODS raise ValueError unless unsafe_methods is set.
+        """
+        unsafe = sorted({method.upper() for method, _ in targets} - self.SAFE_METHODS)
+        if unsafe and not self.unsafe_methods:
+            raise ValueError(f"Load testing with {', '.join(unsafe)} can change data; enable unsafe methods to allow it")
+        results = [LoadStats(method.upper(), urljoin(base_url, path))
+                   for base_url in self.base_urls for method, path in targets]
+        if not results:
+            return results
+
+        logger.info(f"Load testing {len(results)} endpoints for {duration}s")
+        async with self._session(concurrency * len(results), 0) as session:
+            deadline = time.perf_counter() + duration
+            await asyncio.gather(*(
+                self._load_endpoint(session, stats, deadline, rate, concurrency) for stats in results
+            ))
+        return results
@@ -0,0 +1,108 @@
+"""Baseline of accepted findings"""
+
+import os
+import re
+import json
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+from datetime import datetime
+
+from .constants import DETECTOR_VERSION
+from .findings import BugReport
+
+logger = logging.getLogger(__name__)
+
+class FindingBaseline:
+    """Accepted findings that are left out of reports.
+
+    Each finding is fingerprinted by its category and description, its code
+    snippet with whitespace collapsed, and its path relative to the project
+    root, but not its line number, so entries survive code moving around. The
+    fingerprints are held in a dict of counts: a baseline with two identical
+    findings in a file suppresses at most two, and every lookup is O(1).
+    """
+
+    FORMAT_VERSION = 1
+    WHITESPACE = re.compile(r'\s+')
+
+    def __init__(self, root_path: str):
+        self.root_path = Path(root_path).resolve()
+        self.counts: Dict[str, int] = {}
+        self._relative_paths: Dict[str, str] = {}
+
+    def _relative(self, file_path: str) -> str:
+        relative = self._relative_paths.get(file_path)
+        if relative is None:
+            if '://' in file_path:
+                relative = file_path
+            else:
+                try:
+                    relative = Path(file_path).resolve().relative_to(self.root_path).as_posix()
+                except ValueError:
+                    relative = Path(file_path).as_posix()
+            self._relative_paths[file_path] = relative
+        return relative
+
+    def fingerprint(self, bug: BugReport) -> str:
+        snippet = self.WHITESPACE.sub(' ', bug.code_snippet).strip()
+        key = '\0'.join((bug.category, bug.description, snippet, self._relative(bug.file_path)))
+        return hashlib.blake2b(key.encode('utf-8'), digest_size=12).hexdigest()
+
+    def load(self, baseline_path: str) -> 'FindingBaseline':
+        """Load a baseline file; a missing file is an empty baseline"""
+        self.counts = {}
+        try:
+            with open(baseline_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            logger.warning(f"Baseline {baseline_path} not found; reporting all findings")
+            return self
+        if data.get('format') != self.FORMAT_VERSION:
+            raise ValueError(f"Unsupported baseline format in {baseline_path}: {data.get('format')}")
+        for entry in data.get('findings', []):
+            self.counts[entry['fingerprint']] = self.counts.get(entry['fingerprint'], 0) + entry.get('count', 1)
+        logger.info(f"Loaded {sum(self.counts.values())} baseline findings from {baseline_path}")
+        return self
+
+    def filter(self, bugs: Iterable[BugReport]) -> Tuple[List[BugReport], int]:
+        """Return (findings not in the baseline, number suppressed)"""
+        remaining = dict(self.counts)
+        new = []
+        suppressed = 0
+        for bug in bugs:
+            fingerprint = self.fingerprint(bug)
+            count = remaining.get(fingerprint, 0)
+            if count:
+                remaining[fingerprint] = count - 1
+                suppressed += 1
+            else:
+                new.append(bug)
+        return new, suppressed
+
+    def write(self, baseline_path: str, results: Dict[str, List[BugReport]]):
+        """Write every finding in results as accepted"""
+        entries: Dict[str, Dict] = {}
+        for bugs in results.values():
+            for bug in bugs:
+                fingerprint = self.fingerprint(bug)
+                entry = entries.get(fingerprint)
+                if entry is None:
+                    entries[fingerprint] = {
+                        'fingerprint': fingerprint, 'count': 1, 'category': bug.category,
+                        'file': self._relative(bug.file_path), 'snippet': bug.code_snippet[:200],
+                    }
+                else:
+                    entry['count'] += 1
+        data = {
+            'format': self.FORMAT_VERSION,
+            'detector_version': DETECTOR_VERSION,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'findings': sorted(entries.values(), key=lambda entry: (entry['file'], entry['category'], entry['fingerprint'])),
+        }
+        tmp_path = baseline_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1)
+        os.replace(tmp_path, baseline_path)
+        logger.info(f"Wrote {len(entries)} baseline entries to {baseline_path}")
@@ -0,0 +1,105 @@
+"""Persistent content-hash result cache"""
+
+import os
+import json
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, List, Tuple, Optional
+
+from .findings import BugReport
+
+logger = logging.getLogger(__name__)
+
+class ResultCache:
+    """On-disk cache of per-file analysis results.
+
+    Entries are keyed by file path and validated against a hash of the file
+    contents, and hold the file's findings and its RouteIndexer index. The whole cache is tied to the analyzer fingerprint (pattern set,
+    rule maps and detector version) and is discarded when that changes.
+    """
+
+    FORMAT_VERSION = 3
+
+    def __init__(self, cache_path: str):
+        self.cache_path = Path(cache_path)
+        self.fingerprint = ''
+        self.entries: Dict[str, Dict] = {}
+        self.dirty = False
+
+    def load(self, fingerprint: str):
+        """Load cached entries that were produced with the given fingerprint"""
+        self.fingerprint = fingerprint
+        self.entries = {}
+        self.dirty = False
+
+        if not self.cache_path.exists():
+            return
+
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable result cache {self.cache_path}: {e}")
+            self.dirty = True
+            return
+
+        if data.get('format') != self.FORMAT_VERSION or data.get('fingerprint') != fingerprint:
+            logger.info("Result cache is stale, rebuilding")
+            self.dirty = True
+            return
+
+        self.entries = data.get('files', {})
+
+    @staticmethod
+    def file_digest(file_path: Path) -> Optional[str]:
+        """Return the content hash of a file, or None if it cannot be read"""
+        digest = hashlib.blake2b(digest_size=16)
+        try:
+            with open(file_path, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(block)
+            return digest.hexdigest()
+        except OSError:
+            return None
+
+    def lookup(self, file_path: Path) -> Tuple[Optional[str], Optional[List[BugReport]], Dict]:
+        """Return (digest, cached bugs, route index); bugs is None when the entry is missing or stale"""
+        digest = self.file_digest(file_path)
+        entry = self.entries.get(str(file_path))
+        if digest is None or entry is None or entry.get('digest') != digest:
+            return digest, None, {}
+        return digest, [BugReport(**bug) for bug in entry['bugs']], entry.get('routes', {})
+
+    def store(self, file_path: Path, digest: str, bugs: List[BugReport], route_index: Optional[Dict] = None):
+        """Record the analysis result for a file"""
+        entry = {'digest': digest, 'bugs': [bug.to_dict() for bug in bugs]}
+        if route_index:
+            entry['routes'] = route_index
+        self.entries[str(file_path)] = entry
+        self.dirty = True
+
+    def save(self, live_files: Optional[List[Path]] = None):
+        """Write the cache, evicting entries for files that no longer exist
+
+        live_files is the complete set of files found by a full scan. Partial
+        scans pass None, which keeps entries for files that were not visited.
+        """
+        if live_files is not None:
+            live = {str(file_path) for file_path in live_files}
+            for key in [key for key in self.entries if key not in live]:
+                del self.entries[key]
+                self.dirty = True
+
+        if not self.dirty:
+            return
+
+        data = {'format': self.FORMAT_VERSION, 'fingerprint': self.fingerprint, 'files': self.entries}
+        tmp_path = self.cache_path.with_name(self.cache_path.name + '.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.cache_path)
+            self.dirty = False
+        except OSError as e:
+            logger.warning(f"Could not write result cache {self.cache_path}: {e}")
@@ -0,0 +1,246 @@
+"""
+Command line interface of the DREAM-SVN backend bug detector.
+
+Logging is configured here, when the CLI runs, and never on import. Modules
+that only some options need (the API tester and its HTTP stack, the watch
+mode, the guarded scanner, git) are imported when those options are used,
+so a static-only run starts without them.
+
+Usage: python -m bugdetector [options]  (or: python bug_detector.py [options])
+"""
+
+import os
+import sys
+import json
+import argparse
+import logging
+import shutil
+from pathlib import Path
+from typing import List, Optional
+
+from .constants import (DEFAULT_CACHE_FILE, DEFAULT_LARGE_FILE_THRESHOLD, LARGE_FILE_MODES,
+                        DEFAULT_PATTERN_BUDGET, DEFAULT_BASELINE_FILE, WATCH_MODES)
+from .baseline import FindingBaseline
+from .analyzer import CodeAnalyzer
+from .report import REPORT_WRITERS, DEFAULT_REPORT_FILES
+from .detector import BugDetector
+
+LOG_FILE = 'bug_detection.log'
+
+logger = logging.getLogger(__name__)
+
+def configure_logging(log_file: Optional[str] = LOG_FILE):
+    """Log INFO and above to stderr and, if given, to log_file"""
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        handlers.insert(0, logging.FileHandler(log_file))
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=handlers
+    )
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description='DREAM-SVN Backend Bug Detection Tool')
+    parser.add_argument('--root', default=str(Path(__file__).resolve().parent.parent),
+                        help='Directory to analyze (default: the backend directory)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Worker processes for static analysis (0 = one per CPU)')
+    parser.add_argument('--cache-file', default=None,
+                        help=f'Result cache location (default: <root>/{DEFAULT_CACHE_FILE})')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Analyze every file without reading or writing the result cache')
+    parser.add_argument('--diff-base', metavar='REF', default=None,
+                        help='Only analyze .js, package.json and .env files changed since this git revision')
+    parser.add_argument('--changed-lines-only', action='store_true',
+                        help='With --diff-base, only report findings inside changed hunks')
+    parser.add_argument('--large-file-threshold', type=int, default=DEFAULT_LARGE_FILE_THRESHOLD,
+                        metavar='BYTES', help='Size at which files take the large-file path (0 = never)')
+    parser.add_argument('--large-file-mode', choices=LARGE_FILE_MODES, default='stream',
+                        help='How to handle large files: scan fully, scan the start only, or skip')
+    parser.add_argument('--structural', action='store_true',
+                        help='Check loop nesting and route error handling on a parsed block tree '
+                             'instead of with brace-matching regexes')
+    parser.add_argument('--file-timeout', type=float, default=None, metavar='SECONDS',
+                        help='Analyze each file in a killable worker with this time limit')
+    parser.add_argument('--pattern-budget', type=float, default=DEFAULT_PATTERN_BUDGET, metavar='SECONDS',
+                        help='Per-rule time budget reported on, with --file-timeout')
+    parser.add_argument('--fuzz-patterns', action='store_true',
+                        help='Measure the worst-case input length each rule tolerates and exit')
+    parser.add_argument('--fuzz-budget', type=float, default=1.0, metavar='SECONDS',
+                        help='Time budget per rule and input for --fuzz-patterns')
+    parser.add_argument('--fuzz-max-length', type=int, default=4 * 1024 * 1024, metavar='CHARS',
+                        help='Largest input generated by --fuzz-patterns')
+    parser.add_argument('--profile', action='store_true',
+                        help='Record per-rule, per-file and per-checker costs (disables the result cache)')
+    parser.add_argument('--profile-top', type=int, default=10, metavar='N',
+                        help='Number of slowest rules and files listed in the report')
+    parser.add_argument('--profile-output', default='bug_detector_profile.json',
+                        help='Where --profile writes its JSON data')
+    parser.add_argument('--api-test', action='store_true',
+                        help='Probe running services for injection issues')
+    parser.add_argument('--api-url', action='append', default=None, metavar='URL',
+                        help='Base URL for --api-test and --load-test (repeatable; required by both)')
+    parser.add_argument('--api-concurrency', type=int, default=8, metavar='N',
+                        help='Concurrent requests per host for --api-test')
+    parser.add_argument('--api-timeout', type=float, default=10.0, metavar='SECONDS',
+                        help='Read timeout per request for --api-test')
+    parser.add_argument('--api-unsafe-methods', action='store_true',
+                        help='Also send POST/PUT/PATCH/DELETE requests, which can change or delete data; '
+                             'only use against disposable environments')
+    parser.add_argument('--load-test', action='append', default=None, metavar='[METHOD ]PATH',
+                        help='Put this endpoint under load on every API base URL (repeatable)')
+    parser.add_argument('--load-duration', type=float, default=10.0, metavar='SECONDS',
+                        help='How long --load-test runs')
+    parser.add_argument('--load-rate', type=float, default=None, metavar='RPS',
+                        help='Requests per second per endpoint (default: closed loop at --load-concurrency)')
+    parser.add_argument('--load-concurrency', type=int, default=10, metavar='N',
+                        help='Requests in flight per endpoint for --load-test')
+    parser.add_argument('--format', choices=sorted(REPORT_WRITERS), default='text',
+                        help='Report format: text, JSON Lines or SARIF 2.1.0')
+    parser.add_argument('--output', default=None, metavar='PATH',
+                        help='Report file (default: bug_detection_report.txt/.jsonl/.sarif)')
+    parser.add_argument('--no-dedup', action='store_true',
+                        help='Report every pattern match instead of one finding per file, line and rule')
+    parser.add_argument('--group-by-rule', action='store_true',
+                        help='List each rule once with the files and lines it was found at')
+    parser.add_argument('--baseline', nargs='?', const=DEFAULT_BASELINE_FILE, default=None, metavar='PATH',
+                        help=f'Only report findings missing from this baseline (default: <root>/{DEFAULT_BASELINE_FILE})')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Write all current findings to the --baseline file instead of filtering by it')
+    parser.add_argument('--list-endpoints', action='store_true',
+                        help='Print the Express endpoints found by the static scan and exit')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep running and re-analyze JavaScript files as they change')
+    parser.add_argument('--watch-mode', choices=WATCH_MODES, default='auto',
+                        help='How --watch detects changes (auto: inotify where available, else polling)')
+    parser.add_argument('--watch-interval', type=float, default=1.0, metavar='SECONDS',
+                        help='Polling interval for --watch without inotify')
+    args = parser.parse_args(argv)
+    if args.changed_lines_only and not args.diff_base:
+        parser.error('--changed-lines-only requires --diff-base')
+    args.load_targets = []
+    for target in args.load_test or []:
+        method, _, path = target.strip().rpartition(' ')
+        args.load_targets.append((method.strip().upper() or 'GET', path))
+    if (args.api_test or args.load_targets) and not args.api_url:
+        parser.error('--api-test and --load-test require --api-url')
+    unsafe = {method for method, _ in args.load_targets} - {'GET', 'HEAD'}
+    if unsafe and not args.api_unsafe_methods:
+        parser.error(f"--load-test with {', '.join(sorted(unsafe))} requires --api-unsafe-methods")
+    if args.update_baseline and not args.baseline:
+        args.baseline = DEFAULT_BASELINE_FILE
+    if args.baseline == DEFAULT_BASELINE_FILE:
+        args.baseline = os.path.join(args.root, DEFAULT_BASELINE_FILE)
+    if args.no_cache or args.profile:
+        # A profile of cache hits would be empty; every file has to be analyzed
+        args.cache_file = None
+    elif args.cache_file is None:
+        args.cache_file = os.path.join(args.root, DEFAULT_CACHE_FILE)
+    return args
+
+def main(argv: Optional[List[str]] = None):
+    """Main execution function"""
+    args = parse_args(argv)
+    configure_logging()
+
+    if args.fuzz_patterns:
+        from .guard import PatternFuzzer
+        fuzzer = PatternFuzzer(CodeAnalyzer(args.root), budget=args.fuzz_budget,
+                               max_length=args.fuzz_max_length)
+        results = fuzzer.run()
+        print(PatternFuzzer.format_results(results))
+        with open('pattern_fuzz_results.json', 'w') as f:
+            json.dump(results, f, indent=2)
+        return
+
+    if args.list_endpoints:
+        analyzer = CodeAnalyzer(args.root, cache_path=args.cache_file,
+                                large_file_threshold=args.large_file_threshold,
+                                large_file_mode=args.large_file_mode,
+                                structural=args.structural)
+        analyzer.analyze_all_files(jobs=args.jobs)
+        for endpoint in analyzer.endpoints:
+            print(f"{endpoint.method:<7} {endpoint.path:<60} {endpoint.file_path}:{endpoint.line_number}")
+        return
+    
+    diff_scope = None
+    if args.diff_base:
+        from .diff_scope import GitDiffScope
+        try:
+            diff_scope = GitDiffScope(args.root, args.diff_base, args.changed_lines_only).load()
+        except RuntimeError as e:
+            sys.exit(f"Cannot compare against {args.diff_base}: {e}")
+
+    baseline = None
+    if args.baseline and not args.update_baseline:
+        baseline = FindingBaseline(args.root).load(args.baseline)
+
+    if args.watch:
+        from .watch import WatchSession
+        analyzer = CodeAnalyzer(args.root, cache_path=args.cache_file,
+                                large_file_threshold=args.large_file_threshold,
+                                large_file_mode=args.large_file_mode,
+                                structural=args.structural)
+        WatchSession(analyzer, jobs=args.jobs, dedup=not args.no_dedup,
+                     baseline=baseline).run(args.watch_mode, args.watch_interval)
+        return
+
+    # Initialize bug detector
+    detector = BugDetector(args.root, jobs=args.jobs, cache_path=args.cache_file,
+                           diff_scope=diff_scope,
+                           large_file_threshold=args.large_file_threshold,
+                           large_file_mode=args.large_file_mode,
+                           file_timeout=args.file_timeout,
+                           pattern_budget=args.pattern_budget,
+                           profile=args.profile,
+                           profile_top=args.profile_top,
+                           api_test=args.api_test,
+                           api_urls=args.api_url,
+                           api_concurrency=args.api_concurrency,
+                           api_timeout=args.api_timeout,
+                           api_unsafe_methods=args.api_unsafe_methods,
+                           load_targets=args.load_targets,
+                           load_duration=args.load_duration,
+                           load_rate=args.load_rate,
+                           load_concurrency=args.load_concurrency,
+                           dedup=not args.no_dedup,
+                           group_by_rule=args.group_by_rule,
+                           baseline=baseline,
+                           structural=args.structural)
+    
+    try:
+        # Run all tests; the event loop is only needed to probe running services
+        if detector.needs_network:
+            import asyncio
+            results = asyncio.run(detector.run_all_tests())
+        else:
+            results = detector.run_static_tests()
+
+        if args.update_baseline:
+            FindingBaseline(args.root).write(args.baseline, results)
+        
+        # Stream the report to its file
+        output = args.output or DEFAULT_REPORT_FILES[args.format]
+        with open(output, 'w', encoding='utf-8') as f:
+            writer = REPORT_WRITERS[args.format](f, args.root, args.group_by_rule)
+            detector.write_report(results, writer)
+
+        # Print the text report, or a summary for machine-readable formats
+        if args.format == 'text':
+            with open(output, 'r', encoding='utf-8') as f:
+                shutil.copyfileobj(f, sys.stdout)
+        else:
+            counts = ', '.join(f"{severity}: {count}" for severity, count in writer.severity_counts.items())
+            print(f"Total Issues Found: {writer.total} ({counts})")
+
+        if detector.profile is not None:
+            detector.profile.write_json(args.profile_output, args.profile_top)
+            logger.info(f"Profile data saved to {args.profile_output}")
+        
+        logger.info(f"Bug detection completed. Report saved to {output}")
+        
+    except Exception as e:
+        logger.error(f"Error during bug detection: {e}")
+        raise
@@ -0,0 +1,112 @@
+"""package.json and .env checks"""
+
+import re
+import json
+import logging
+from pathlib import Path
+from typing import List, Optional, TYPE_CHECKING
+
+from .findings import BugReport
+from .walker import ProjectWalker
+
+if TYPE_CHECKING:
+    from .diff_scope import GitDiffScope
+
+logger = logging.getLogger(__name__)
+
+class ConfigValidator:
+    """Validate configuration files and environment setup"""
+    
+    def __init__(self, root_path: str, walker: Optional[ProjectWalker] = None,
+                 diff_scope: Optional['GitDiffScope'] = None):
+        self.root_path = Path(root_path)
+        self.bugs: List[BugReport] = []
+        self.walker = walker or ProjectWalker(root_path)
+        # With a diff scope only the config files changed since its base are checked
+        self.diff_scope = diff_scope
+
+    def _files(self, bucket: str) -> List[Path]:
+        if self.diff_scope is not None:
+            return self.diff_scope.config_files(bucket)
+        return self.walker.files(bucket)
+
+    def validate_configs(self) -> List[BugReport]:
+        """Validate configuration files"""
+        bugs = []
+        
+        # Check package.json files
+        package_files = self._files('package_json')
+        
+        for package_file in package_files:
+            try:
+                with open(package_file, 'r') as f:
+                    package_data = json.load(f)
+                
+                # Check for security vulnerabilities in dependencies
+                if 'dependencies' in package_data:
+                    vulnerable_packages = [
+                        'lodash', 'moment', 'request', 'node-uuid'  # Known vulnerable packages
+                    ]
+                    
+                    for pkg in vulnerable_packages:
+                        if pkg in package_data['dependencies']:
+                            bugs.append(BugReport(
+                                severity='medium',
+                                category='security',
+                                file_path=str(package_file),
+                                line_number=0,
+                                description=f'Potentially vulnerable dependency: {pkg}',
+                                recommendation=f'Update or replace {pkg} with a secure alternative',
+                                code_snippet=f'{pkg}: {package_data["dependencies"][pkg]}'
+                            ))
+                
+                # Check for missing scripts
+                if 'scripts' in package_data:
+                    required_scripts = ['test', 'lint']
+                    for script in required_scripts:
+                        if script not in package_data['scripts']:
+                            bugs.append(BugReport(
+                                severity='low',
+                                category='config',
+                                file_path=str(package_file),
+                                line_number=0,
+                                description=f'Missing {script} script in package.json',
+                                recommendation=f'Add {script} script for better development workflow',
+                                code_snippet=f'Missing: {script}'
+                            ))
+                            
+            except Exception as e:
+                logger.error(f"Error validating {package_file}: {e}")
+        
+        # Check for .env files with sensitive data
+        env_files = self._files('env')
+        
+        for env_file in env_files:
+            try:
+                with open(env_file, 'r') as f:
+                    content = f.read()
+                
+                # Check for hardcoded values that should be secrets
+                sensitive_patterns = [
+                    r'PASSWORD=.{1,20}$',
+                    r'SECRET=.{1,32}$',
+                    r'API_KEY=.{1,32}$'
+                ]
+                
+                for pattern in sensitive_patterns:
+                    if re.search(pattern, content, re.MULTILINE):
+                        bugs.append(BugReport(
+                            severity='high',
+                            category='security',
+                            file_path=str(env_file),
+                            line_number=0,
+                            description='Weak or short secret detected in environment file',
+                            recommendation='Use strong, randomly generated secrets',
+                            code_snippet='Sensitive data detected'
+                        ))
+                        
+            except Exception as e:
+                logger.error(f"Error checking {env_file}: {e}")
+        
+        self.bugs = bugs
+        return bugs
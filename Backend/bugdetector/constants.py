@@ -0,0 +1,33 @@
+"""Version, defaults and shared markers"""
+
+import re
+
+DETECTOR_VERSION = '1.1.1'
+DEFAULT_CACHE_FILE = '.bug_detector_cache.json'
+
+# Longest code snippet kept per finding; longer lines (minified bundles) are
+# cut to a window around the match
+MAX_SNIPPET_CHARS = 200
+
+# Files at or above this size take the large-file path in CodeAnalyzer.analyze_file
+DEFAULT_LARGE_FILE_THRESHOLD = 4 * 1024 * 1024
+LARGE_FILE_MODES = ('stream', 'sample', 'skip')
+LARGE_FILE_SAMPLE_CHARS = 1024 * 1024
+# Rule id under which CodeAnalyzer._check_file_specific_issues is timed and skipped
+FILE_CHECKS_RULE_ID = 'file_specific_checks'
+
+# Defaults for the guarded (--file-timeout) scan mode
+DEFAULT_PATTERN_BUDGET = 2.0
+
+# Bytes whose presence rules out matching a memory-mapped file with bytes patterns
+NON_PLAIN_ASCII = re.compile(rb'[\x80-\xff\r\x1c-\x1f]')
+
+# Inline suppression comment; it covers its own line and, when it is alone on
+# its line, the line below it. Only real comments count, not string or regex
+# contents. Without categories it suppresses every finding on those lines.
+INLINE_IGNORE_MARKER = 'bugdetector-ignore'
+INLINE_IGNORE = re.compile(r'(?://|/\*)[ \t]*bugdetector-ignore\b([ \t\w,-]*)')
+DEFAULT_BASELINE_FILE = '.bug_detector_baseline.json'
+
+# Change detection backends for the --watch mode (see WatchSession.run)
+WATCH_MODES = ('auto', 'inotify', 'poll')
@@ -0,0 +1,170 @@
+"""Main bug detection orchestrator"""
+
+import io
+import time
+import logging
+from typing import Dict, Iterable, List, Tuple, Optional, TYPE_CHECKING
+
+from .constants import DEFAULT_LARGE_FILE_THRESHOLD, DEFAULT_PATTERN_BUDGET
+from .findings import BugReport, dedup_findings
+from .walker import ProjectWalker
+from .baseline import FindingBaseline
+from .profiling import ScanProfile
+from .analyzer import CodeAnalyzer
+from .config import ConfigValidator
+from .report import ReportWriter, TextReportWriter
+
+if TYPE_CHECKING:
+    from .api import APITester, LoadStats
+    from .diff_scope import GitDiffScope
+
+logger = logging.getLogger(__name__)
+
+class BugDetector:
+    """Main bug detection orchestrator"""
+    
+    def __init__(self, root_path: str, jobs: int = 1, cache_path: Optional[str] = None,
+                 diff_scope: Optional['GitDiffScope'] = None,
+                 large_file_threshold: int = DEFAULT_LARGE_FILE_THRESHOLD,
+                 large_file_mode: str = 'stream', file_timeout: Optional[float] = None,
+                 pattern_budget: float = DEFAULT_PATTERN_BUDGET, profile: bool = False,
+                 profile_top: int = 10, api_test: bool = False, api_urls: Optional[List[str]] = None,
+                 api_concurrency: int = 8, api_timeout: float = 10.0, api_unsafe_methods: bool = False,
+                 load_targets: Optional[List[Tuple[str, str]]] = None, load_duration: float = 10.0,
+                 load_rate: Optional[float] = None, load_concurrency: int = 10,
+                 dedup: bool = True, group_by_rule: bool = False,
+                 baseline: Optional[FindingBaseline] = None, structural: bool = False):
+        self.root_path = root_path
+        self.jobs = jobs
+        self.profile = ScanProfile() if profile else None
+        self.profile_top = profile_top
+        self.walker = ProjectWalker(root_path)
+        self.code_analyzer = CodeAnalyzer(root_path, cache_path=cache_path, diff_scope=diff_scope,
+                                          walker=self.walker,
+                                          large_file_threshold=large_file_threshold,
+                                          large_file_mode=large_file_mode,
+                                          file_timeout=file_timeout,
+                                          pattern_budget=pattern_budget,
+                                          profile=self.profile,
+                                          structural=structural)
+        self.config_validator = ConfigValidator(root_path, walker=self.walker, diff_scope=diff_scope)
+        self.api_test = api_test
+        # API and load tests send traffic only to base URLs named by the caller
+        self.api_urls = api_urls or []
+        self.api_concurrency = api_concurrency
+        self.api_timeout = api_timeout
+        self.api_unsafe_methods = api_unsafe_methods
+        self._api_tester: Optional['APITester'] = None
+        self.load_targets = load_targets or []
+        if self.needs_network and not self.api_urls:
+            raise ValueError("API and load testing need explicit api_urls")
+        self.load_duration = load_duration
+        self.load_rate = load_rate
+        self.load_concurrency = load_concurrency
+        self.load_results: List['LoadStats'] = []
+        self.dedup = dedup
+        self.group_by_rule = group_by_rule
+        self.baseline = baseline
+        self.baseline_suppressed = 0
+        
+    @property
+    def api_tester(self) -> 'APITester':
+        """The API tester, created on first use so static-only runs never load the HTTP stack"""
+        if self._api_tester is None:
+            from .api import APITester
+            self._api_tester = APITester(self.api_urls, per_host_limit=self.api_concurrency,
+                                         read_timeout=self.api_timeout,
+                                         unsafe_methods=self.api_unsafe_methods)
+        return self._api_tester
+
+    @property
+    def needs_network(self) -> bool:
+        """Whether API or load testing is enabled, so run_all_tests has to be awaited"""
+        return self.api_test or bool(self.load_targets)
+
+    def _run_static_checks(self) -> Dict[str, List[BugReport]]:
+        """Run static code analysis and configuration validation"""
+        results = {}
+        
+        # Static code analysis
+        logger.info("Running static code analysis...")
+        start = time.perf_counter()
+        results['static_analysis'] = self.code_analyzer.analyze_all_files(jobs=self.jobs)
+        results['scan_budget'] = self.code_analyzer.budget_violations
+        if self.profile is not None:
+            self.profile.add_checker('static_analysis', time.perf_counter() - start)
+        
+        # Configuration validation
+        logger.info("Validating configurations...")
+        start = time.perf_counter()
+        results['config_validation'] = self.config_validator.validate_configs()
+        if self.profile is not None:
+            self.profile.add_checker('config_validation', time.perf_counter() - start)
+
+        results['api_testing'] = []
+        return results
+
+    def _filter_results(self, results: Dict[str, List[BugReport]]) -> Dict[str, List[BugReport]]:
+        """Apply deduplication and the baseline to every results section"""
+        if self.dedup:
+            results = {section: dedup_findings(bugs) for section, bugs in results.items()}
+
+        if self.baseline is not None:
+            self.baseline_suppressed = 0
+            for section, bugs in results.items():
+                results[section], suppressed = self.baseline.filter(bugs)
+                self.baseline_suppressed += suppressed
+            logger.info(f"Baseline suppressed {self.baseline_suppressed} known findings")
+        
+        return results
+
+    def run_static_tests(self) -> Dict[str, List[BugReport]]:
+        """Run the static checks only, without an event loop or the HTTP stack"""
+        logger.info("Starting static bug detection...")
+        return self._filter_results(self._run_static_checks())
+
+    async def run_all_tests(self) -> Dict[str, List[BugReport]]:
+        """Run all bug detection tests"""
+        logger.info("Starting comprehensive bug detection...")
+        
+        results = self._run_static_checks()
+        
+        # API testing is opt-in as it requires running services
+        if self.api_test:
+            logger.info("Testing API endpoints...")
+            self.api_tester.catalogue = self.code_analyzer.endpoints
+            start = time.perf_counter()
+            results['api_testing'] = await self.api_tester.test_endpoints()
+            if self.profile is not None:
+                self.profile.add_checker('api_testing', time.perf_counter() - start)
+
+        # Load testing is opt-in for the same reason; its results get their own report section
+        if self.load_targets:
+            start = time.perf_counter()
+            self.load_results = await self.api_tester.load_test(
+                self.load_targets, self.load_duration, self.load_rate, self.load_concurrency
+            )
+            if self.profile is not None:
+                self.profile.add_checker('load_testing', time.perf_counter() - start)
+
+        return self._filter_results(results)
+    
+    def write_report(self, results: Dict[str, Iterable[BugReport]], writer: ReportWriter):
+        """Stream the results, load test and profile sections through a report writer"""
+        writer.suppressed = self.baseline_suppressed
+        writer.begin()
+        for category, bugs in results.items():
+            writer.write_section(category, bugs)
+        if self.load_results:
+            writer.write_load_results(self.load_results, {
+                'rate': self.load_rate, 'concurrency': self.load_concurrency, 'duration': self.load_duration
+            })
+        if self.profile is not None:
+            writer.write_profile(self.profile, self.profile_top)
+        writer.finish()
+
+    def generate_report(self, results: Dict[str, List[BugReport]]) -> str:
+        """Generate a comprehensive bug report"""
+        buffer = io.StringIO()
+        self.write_report(results, TextReportWriter(buffer, self.root_path, self.group_by_rule))
+        return buffer.getvalue()
@@ -0,0 +1,115 @@
+"""Changed files and hunks from local git"""
+
+import os
+import re
+import subprocess
+import logging
+from pathlib import Path
+from fnmatch import fnmatchcase
+from typing import Dict, List, Tuple, Optional
+
+from .findings import BugReport
+from .walker import ProjectWalker
+
+logger = logging.getLogger(__name__)
+
+class GitDiffScope:
+    """Changed JavaScript files and line ranges relative to a git base revision.
+
+    Only the local repository is consulted. Files modified in the working tree,
+    files added since base_ref and untracked files are all in scope; untracked
+    files count as changed in full. Changed package.json and .env files are
+    collected too, so the config checks can be limited to them.
+    """
+
+    HUNK_HEADER = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+    # Config file names in git pathspec form, at the top level and below it
+    CONFIG_PATHSPECS = ('package.json', '*/package.json', '.env*', '*/.env*')
+
+    def __init__(self, root_path: str, base_ref: str, changed_lines_only: bool = False):
+        self.root_path = Path(root_path)
+        self.base_ref = base_ref
+        self.changed_lines_only = changed_lines_only
+        # file path -> changed (start, end) line ranges, or None for the whole file
+        self.changes: Dict[str, Optional[List[Tuple[int, int]]]] = {}
+        # changed package.json and .env file paths
+        self.config_changes: List[str] = []
+
+    def _git(self, *args: str) -> str:
+        try:
+            result = subprocess.run(
+                ['git', '-c', 'core.quotePath=false', *args],
+                cwd=self.root_path, capture_output=True, text=True
+            )
+        except OSError as e:
+            raise RuntimeError(f"could not run git: {e}")
+        if result.returncode != 0:
+            raise RuntimeError(f"git {' '.join(args)} failed: {result.stderr.strip()}")
+        return result.stdout
+
+    @staticmethod
+    def _unquote(path: str) -> str:
+        if len(path) > 1 and path[0] == path[-1] == '"':
+            return path[1:-1].encode('latin-1', 'backslashreplace').decode('unicode_escape')
+        return path
+
+    def load(self) -> 'GitDiffScope':
+        """Collect changed files and hunks from git"""
+        self.changes = {}
+
+        diff = self._git('diff', '--relative', '--no-prefix', '--no-color', '--unified=0',
+                         '--diff-filter=ACMR', self.base_ref, '--', '*.js')
+        current: Optional[List[Tuple[int, int]]] = None
+        for line in diff.splitlines():
+            if line.startswith('+++ '):
+                # git ends the name with a tab when it contains spaces
+                path = str(self.root_path / self._unquote(line[4:].rstrip('\t')))
+                current = self.changes.setdefault(path, [])
+            elif line.startswith('@@') and current is not None:
+                match = self.HUNK_HEADER.match(line)
+                if match:
+                    start = int(match.group(1))
+                    count = int(match.group(2)) if match.group(2) is not None else 1
+                    if count > 0:
+                        current.append((start, start + count - 1))
+
+        for name in self._untracked('*.js'):
+            self.changes[str(self.root_path / name)] = None
+
+        configs = self._git('diff', '--relative', '--name-only', '-z', '--diff-filter=ACMR',
+                            self.base_ref, '--', *self.CONFIG_PATHSPECS).split('\0')
+        configs += self._untracked(*self.CONFIG_PATHSPECS)
+        self.config_changes = sorted({str(self.root_path / name) for name in configs if name})
+
+        for path in [path for path in self.changes if 'node_modules' in path]:
+            del self.changes[path]
+        self.config_changes = [path for path in self.config_changes if 'node_modules' not in path]
+
+        logger.info(f"{len(self.changes)} JavaScript files and {len(self.config_changes)} "
+                    f"config files changed since {self.base_ref}")
+        return self
+
+    def _untracked(self, *pathspecs: str) -> List[str]:
+        """Return untracked, non-ignored file names matching pathspecs"""
+        output = self._git('ls-files', '--others', '--exclude-standard', '-z', '--', *pathspecs)
+        return [name for name in output.split('\0') if name]
+
+    def js_files(self) -> List[Path]:
+        """Return the changed files that still exist, in path order"""
+        return [Path(path) for path in sorted(self.changes) if os.path.isfile(path)]
+
+    def config_files(self, bucket: str) -> List[Path]:
+        """Return the changed files of a ProjectWalker config bucket that still exist"""
+        pattern = ProjectWalker.BUCKETS[bucket]
+        return [Path(path) for path in self.config_changes
+                if fnmatchcase(os.path.basename(path), pattern) and os.path.isfile(path)]
+
+    def covers(self, bug: BugReport) -> bool:
+        """Return True if the finding overlaps a changed hunk"""
+        if bug.file_path not in self.changes:
+            return False
+        ranges = self.changes[bug.file_path]
+        if ranges is None:
+            return True
+        end_line = max(bug.end_line_number, bug.line_number)
+        return any(start <= end_line and bug.line_number <= end for start, end in ranges)
@@ -0,0 +1,148 @@
+"""Precompiled multi-pattern scan engine"""
+
+import re
+import time
+from typing import Dict, List, Tuple, Optional
+
+try:
+    from re import _constants as sre_constants, _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_constants
+    import sre_parse
+
+from .source import JsSourceViews
+
+def as_bytes_pattern(compiled: re.Pattern) -> re.Pattern:
+    """Return a bytes version of a compiled str pattern with the same flags"""
+    return re.compile(compiled.pattern.encode('ascii'), compiled.flags & ~re.UNICODE)
+
+def add_rule_stats(rule_stats: Dict[str, List[float]], rule_id: str,
+                   seconds: float, matches: int, size: int):
+    """Accumulate [seconds, matches, bytes scanned] for a rule"""
+    stats = rule_stats.setdefault(rule_id, [0.0, 0, 0])
+    stats[0] += seconds
+    stats[1] += matches
+    stats[2] += size
+
+class PatternScanEngine:
+    """Precompiled scan engine for the CodeAnalyzer pattern table.
+
+    Every pattern is compiled once and tagged with the literal substrings any
+    match must contain. A file is lowercased once per scan and a pattern is only
+    run when all of its literals are present, so most patterns never touch most
+    files. Hits are yielded in the same order as the original per-pattern loop
+    (category order, then pattern order, then match position).
+
+    Each rule has a JsSourceViews scope, looked up in scopes by rule id and
+    then by category (default DEFAULT_SCOPE); it decides which view of a file
+    the rule is matched against.
+    """
+
+    FLAGS = re.IGNORECASE | re.MULTILINE
+    DEFAULT_SCOPE = 'all'
+
+    def __init__(self, patterns: Dict[str, List[str]], scopes: Optional[Dict[str, str]] = None):
+        self.source = {category: list(category_patterns) for category, category_patterns in patterns.items()}
+        self.scopes = dict(scopes or {})
+        self.rules: List[Tuple[str, re.Pattern, Tuple[str, ...]]] = []
+        # Stable rule names, e.g. 'sql_injection[0]', parallel to self.rules
+        self.rule_ids: List[str] = []
+        # View scope of each rule, parallel to self.rules
+        self.rule_scopes: List[str] = []
+        for category, category_patterns in patterns.items():
+            for position, pattern in enumerate(category_patterns):
+                rule_id = f"{category}[{position}]"
+                scope = self.scopes.get(rule_id, self.scopes.get(category, self.DEFAULT_SCOPE))
+                if scope not in JsSourceViews.SCOPES:
+                    raise ValueError(f"Rule {rule_id} has unknown scope {scope!r}")
+                compiled = re.compile(pattern, self.FLAGS)
+                self.rules.append((category, compiled, self._required_literals(pattern)))
+                self.rule_ids.append(rule_id)
+                self.rule_scopes.append(scope)
+        # bytes versions of self.rules, compiled on first use by _scan_buffer
+        self.byte_rules: Optional[List[Tuple[str, re.Pattern, Tuple[str, ...]]]] = None
+
+    @classmethod
+    def _required_literals(cls, pattern: str) -> Tuple[str, ...]:
+        """Return lowercase literal runs every match of the pattern must contain"""
+        try:
+            parsed = sre_parse.parse(pattern, cls.FLAGS)
+        except Exception:
+            return ()
+
+        literals = []
+        run = []
+        # Only the top-level sequence is mandatory; anything inside a repeat,
+        # branch or group may be skipped, so it just ends the current run.
+        for op, arg in parsed:
+            if op is sre_constants.LITERAL:
+                run.append(chr(arg))
+                continue
+            if run:
+                literals.append(''.join(run).lower())
+                run = []
+        if run:
+            literals.append(''.join(run).lower())
+        return tuple(literals)
+
+    def rule(self, rule_id: str) -> re.Pattern:
+        """Return the compiled pattern for a rule id"""
+        return self.rules[self.rule_ids.index(rule_id)][1]
+
+    def scan(self, content, skip_rules: frozenset = frozenset(),
+             rule_stats: Optional[Dict[str, List[float]]] = None,
+             views: Optional[JsSourceViews] = None):
+        """Yield (category, match) for every pattern hit in content
+
+        content is normally a str. A bytes-like buffer such as an mmap is also
+        accepted; it must hold ASCII text (see CodeAnalyzer._analyze_large_file).
+        If views of the content are given, each rule is matched against the
+        view for its scope; match offsets are the same either way. Rules named
+        in skip_rules are not run. If rule_stats is given, each rule that runs
+        adds [seconds, matches, bytes scanned] to it under its id.
+        """
+        if isinstance(content, str):
+            # The literal prefilter compares against lowercased text, which
+            # mirrors re.IGNORECASE exactly only for ASCII input.
+            lowered = content.lower() if content.isascii() else None
+            rules = self.rules
+            is_present = lowered.__contains__ if lowered is not None else None
+        else:
+            if self.byte_rules is None:
+                self.byte_rules = [
+                    (category, as_bytes_pattern(compiled), literals)
+                    for category, compiled, literals in self.rules
+                ]
+            rules = self.byte_rules
+            is_present = self._buffer_literal_check(content)
+
+        for rule_id, scope, (category, compiled, literals) in zip(self.rule_ids, self.rule_scopes, rules):
+            if rule_id in skip_rules:
+                continue
+            # Views only blank text out, so a literal missing from the content
+            # is missing from every view and the prefilter runs on the content
+            if is_present is not None and not all(is_present(lit) for lit in literals):
+                continue
+            text = content if views is None else views.text(scope)
+            if rule_stats is None:
+                for match in compiled.finditer(text):
+                    yield category, match
+                continue
+
+            start = time.perf_counter()
+            matches = list(compiled.finditer(text))
+            add_rule_stats(rule_stats, rule_id, time.perf_counter() - start, len(matches), len(text))
+            for match in matches:
+                yield category, match
+
+    @staticmethod
+    def _buffer_literal_check(buffer):
+        """Return a memoized case-insensitive literal test for an ASCII buffer"""
+        present: Dict[str, bool] = {}
+
+        def is_present(literal: str) -> bool:
+            if literal not in present:
+                present[literal] = re.search(re.escape(literal.encode('ascii')), buffer, re.IGNORECASE) is not None
+            return present[literal]
+
+        return is_present
@@ -0,0 +1,146 @@
+"""Finding records and the rule metadata they share"""
+
+import sys
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+class RuleInfo(NamedTuple):
+    """Metadata shared by every finding of the same kind"""
+    severity: str  # 'critical', 'high', 'medium', 'low'
+    category: str  # 'security', 'performance', 'logic', 'syntax', 'config'
+    description: str
+    recommendation: str
+
+# One RuleInfo per distinct metadata combination, shared by all findings
+_RULE_TABLE: Dict[Tuple[str, str, str, str], RuleInfo] = {}
+
+def rule_info(severity: str, category: str, description: str, recommendation: str) -> RuleInfo:
+    """Return the shared RuleInfo for this metadata, creating it on first use"""
+    key = (severity, category, description, recommendation)
+    rule = _RULE_TABLE.get(key)
+    if rule is None:
+        rule = _RULE_TABLE[key] = RuleInfo(*key)
+    return rule
+
+def _rule_field(name: str) -> property:
+    """A BugReport attribute stored in its shared RuleInfo"""
+    def get(self):
+        return getattr(self.rule, name)
+
+    def set(self, value):
+        self.rule = rule_info(*self.rule._replace(**{name: value}))
+
+    return property(get, set)
+
+class BugReport:
+    """A single finding.
+
+    Severity, category, description and recommendation live in a shared
+    RuleInfo, so findings of the same kind hold one reference instead of four
+    strings each, and file paths are interned. The constructor, attributes and
+    equality are those of the former dataclass; to_dict() replaces asdict().
+    Hot paths build findings with from_rule().
+    """
+
+    __slots__ = ('rule', 'file_path', 'line_number', 'code_snippet', 'column_number', 'end_line_number',
+                 'match_count')
+    FIELDS = ('severity', 'category', 'file_path', 'line_number', 'description', 'recommendation',
+              'code_snippet', 'column_number', 'end_line_number', 'match_count')
+
+    severity = _rule_field('severity')
+    category = _rule_field('category')
+    description = _rule_field('description')
+    recommendation = _rule_field('recommendation')
+
+    def __init__(self, severity: str, category: str, file_path: str, line_number: int,
+                 description: str, recommendation: str, code_snippet: str = "",
+                 column_number: int = 0, end_line_number: int = 0, match_count: int = 1):
+        self.rule = rule_info(severity, category, description, recommendation)
+        self.file_path = sys.intern(file_path)
+        self.line_number = line_number
+        self.code_snippet = code_snippet
+        self.column_number = column_number  # 1-based column of the match start, 0 if unknown
+        self.end_line_number = end_line_number  # last line covered by the match, 0 if unknown
+        self.match_count = match_count  # matches merged into this finding by dedup_findings
+
+    @classmethod
+    def from_rule(cls, rule: RuleInfo, file_path: str, line_number: int, code_snippet: str = "",
+                  column_number: int = 0, end_line_number: int = 0, match_count: int = 1) -> 'BugReport':
+        """Build a finding for a shared RuleInfo; file_path should already be interned"""
+        bug = cls.__new__(cls)
+        bug.rule = rule
+        bug.file_path = file_path
+        bug.line_number = line_number
+        bug.code_snippet = code_snippet
+        bug.column_number = column_number
+        bug.end_line_number = end_line_number
+        bug.match_count = match_count
+        return bug
+
+    def to_dict(self) -> Dict:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def _values(self) -> Tuple:
+        return (self.rule, self.file_path, self.line_number, self.code_snippet,
+                self.column_number, self.end_line_number, self.match_count)
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._values() == other._values()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{field}={getattr(self, field)!r}" for field in self.FIELDS)
+        return f"{type(self).__name__}({fields})"
+
+    def __reduce__(self):
+        # Re-share the rule and path when findings come back from worker processes
+        return _restore_bug_report, (tuple(self.rule),) + self._values()[1:]
+
+def _restore_bug_report(rule: Tuple, file_path: str, *values) -> BugReport:
+    return BugReport.from_rule(rule_info(*rule), sys.intern(file_path), *values)
+
+def dedup_findings(bugs: Iterable[BugReport]) -> List[BugReport]:
+    """Merge findings that share a file, line and rule into the first of them
+
+    For pattern findings the rule is the category, so the overlapping regexes
+    of one category report a line once. The merged finding keeps the first
+    match's snippet and column, and its match_count is the sum of the counts
+    merged into it. Order of first occurrence is preserved. Merged findings
+    are new objects; the input findings are not modified.
+    """
+    merged: Dict[Tuple[str, int, RuleInfo], BugReport] = {}
+    copied = set()
+    for bug in bugs:
+        key = (bug.file_path, bug.line_number, bug.rule)
+        first = merged.get(key)
+        if first is None:
+            merged[key] = bug
+            continue
+        if key not in copied:
+            # Merge into a copy so the input findings are left as they were
+            first = merged[key] = BugReport.from_rule(first.rule, first.file_path, first.line_number,
+                                                      first.code_snippet, first.column_number,
+                                                      first.end_line_number, first.match_count)
+            copied.add(key)
+        first.match_count += bug.match_count
+        if bug.end_line_number > first.end_line_number:
+            first.end_line_number = bug.end_line_number
+    return list(merged.values())
+
+def group_findings(bugs: Iterable[BugReport]) -> Dict[RuleInfo, Dict[str, List[BugReport]]]:
+    """Group findings by rule, then by file, in order of first occurrence"""
+    groups: Dict[RuleInfo, Dict[str, List[BugReport]]] = {}
+    for bug in bugs:
+        groups.setdefault(bug.rule, {}).setdefault(bug.file_path, []).append(bug)
+    return groups
+
+@dataclass
+class Endpoint:
+    """An Express route found by RouteIndexer"""
+    method: str  # 'GET', 'POST', ...; 'ALL' for app.all/router.all
+    path: str  # full path, including the prefixes of the routers it is mounted under
+    file_path: str
+    line_number: int
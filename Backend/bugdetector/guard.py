@@ -0,0 +1,304 @@
+"""Killable worker processes for the --file-timeout mode, and the pattern fuzzer"""
+
+import multiprocessing
+import multiprocessing.connection
+import time
+import logging
+from pathlib import Path
+from typing import Dict, List, Tuple, Optional
+from collections import deque
+
+from .constants import FILE_CHECKS_RULE_ID, DEFAULT_PATTERN_BUDGET
+from .findings import BugReport
+from .engine import PatternScanEngine
+from .analyzer import CodeAnalyzer, _init_analyzer_worker
+
+logger = logging.getLogger(__name__)
+
+def _time_pattern(analyzer: CodeAnalyzer, rule_id: str, text: str) -> float:
+    """Return the seconds one rule needs to find all matches in text"""
+    if rule_id == FILE_CHECKS_RULE_ID:
+        compiled = analyzer.route_pattern
+    else:
+        compiled = analyzer.scan_engine.rule(rule_id)
+    start = time.perf_counter()
+    for _ in compiled.finditer(text):
+        pass
+    return time.perf_counter() - start
+
+def _guarded_worker_main(conn, analyzer_cls, root_path: str, rule_tables: Dict[str, Dict]):
+    """Serve (command, arg, arg) requests from a GuardedScanner until sent None"""
+    analyzer = _init_analyzer_worker(analyzer_cls, root_path, rule_tables)
+    while True:
+        request = conn.recv()
+        if request is None:
+            break
+        command, first, second = request
+        if command == 'analyze':
+            conn.send(analyzer.scan_file(Path(first), second, profiling=True))
+        elif command == 'probe':
+            conn.send(analyzer.probe_rule(Path(first), second))
+        elif command == 'time_pattern':
+            conn.send(_time_pattern(analyzer, first, second))
+
+class _GuardedWorker:
+    """A worker process that can be killed when a request overruns its deadline"""
+
+    def __init__(self, init_args: tuple):
+        self.init_args = init_args
+        self.deadline = 0.0
+        self._start()
+
+    def _start(self):
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_guarded_worker_main, args=(child_conn, *self.init_args), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+    def send(self, request: tuple, timeout: float):
+        self.conn.send(request)
+        self.deadline = time.monotonic() + timeout
+
+    def restart(self):
+        """Kill the worker, abandoning its current request, and start a fresh one"""
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+        self._start()
+
+    def close(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+class GuardedScanner:
+    """Run analysis requests in worker processes that are killed on timeout.
+
+    A regex stuck in catastrophic backtracking cannot be interrupted from
+    inside the interpreter, so every file is analyzed in a separate process
+    under file_timeout. When a file times out, each rule is probed alone under
+    pattern_budget to find the culprits, and the file is analyzed again
+    without them. Rules that finish but take longer than pattern_budget are
+    reported too. Budget overruns are returned as 'scan_budget' findings.
+    """
+
+    def __init__(self, analyzer: CodeAnalyzer, file_timeout: float,
+                 pattern_budget: float = DEFAULT_PATTERN_BUDGET, workers: int = 1):
+        self.analyzer = analyzer
+        self.file_timeout = file_timeout
+        self.pattern_budget = pattern_budget
+        self.workers = max(1, workers)
+        self.init_args = (type(analyzer), str(analyzer.root_path), analyzer._rule_tables())
+
+    def run_jobs(self, jobs: list) -> list:
+        """Run job generators to completion and return their results in order
+
+        A job yields (request, timeout) pairs and is sent the worker's reply,
+        or None if the request timed out or the worker died.
+        """
+        results = [None] * len(jobs)
+        queue = deque(enumerate(jobs))
+        workers = [_GuardedWorker(self.init_args) for _ in range(min(self.workers, len(jobs)))]
+        idle = list(workers)
+        active: Dict[_GuardedWorker, Tuple[int, object]] = {}
+
+        def advance(worker: _GuardedWorker, index: int, job, reply) -> bool:
+            try:
+                request, timeout = job.send(reply)
+            except StopIteration as stop:
+                results[index] = stop.value
+                return False
+            worker.send(request, timeout)
+            active[worker] = (index, job)
+            return True
+
+        try:
+            while queue or active:
+                while idle and queue:
+                    worker = idle.pop()
+                    index, job = queue.popleft()
+                    if not advance(worker, index, job, None):
+                        idle.append(worker)
+                if not active:
+                    continue
+
+                wait_for = max(0.0, min(worker.deadline for worker in active) - time.monotonic())
+                ready = multiprocessing.connection.wait([worker.conn for worker in active], wait_for)
+                for worker in list(active):
+                    if worker.conn in ready:
+                        try:
+                            reply = worker.conn.recv()
+                        except (EOFError, OSError):
+                            reply = None
+                            worker.restart()
+                    elif time.monotonic() >= worker.deadline:
+                        reply = None
+                        worker.restart()
+                    else:
+                        continue
+                    index, job = active.pop(worker)
+                    if not advance(worker, index, job, reply):
+                        idle.append(worker)
+        finally:
+            for worker in workers:
+                worker.close()
+
+        return results
+
+    def rule_source(self, rule_id: str) -> str:
+        if rule_id == FILE_CHECKS_RULE_ID:
+            return self.analyzer.route_pattern.pattern
+        return self.analyzer.scan_engine.rule(rule_id).pattern
+
+    def _violation(self, file_path: str, rule_id: Optional[str], detail: str) -> BugReport:
+        return BugReport(
+            severity='low',
+            category='scan_budget',
+            file_path=file_path,
+            line_number=0,
+            description=f"{'Rule ' + rule_id if rule_id else 'File analysis'} {detail}",
+            recommendation='Simplify the pattern or exclude the file from analysis',
+            code_snippet=self.rule_source(rule_id) if rule_id else ''
+        )
+
+    def _file_job(self, file_path: str):
+        violations: List[BugReport] = []
+        skip_rules: frozenset = frozenset()
+
+        reply = yield ('analyze', file_path, skip_rules), self.file_timeout
+        if reply is None:
+            logger.warning(f"Analysis of {file_path} exceeded {self.file_timeout}s, probing rules")
+            offending = []
+            for rule_id in self.analyzer.all_rule_ids():
+                elapsed = yield ('probe', file_path, rule_id), self.pattern_budget
+                if elapsed is None:
+                    offending.append(rule_id)
+                    violations.append(self._violation(
+                        file_path, rule_id, f"exceeded its {self.pattern_budget}s budget and was skipped"
+                    ))
+            skip_rules = frozenset(offending)
+            if skip_rules:
+                reply = yield ('analyze', file_path, skip_rules), self.file_timeout
+
+        if reply is None:
+            violations.append(self._violation(
+                file_path, None, f"exceeded the {self.file_timeout}s file timeout; no findings recorded"
+            ))
+            return [], violations, {}, None
+
+        bugs, route_index, record = reply
+        for rule_id, (elapsed, _, _) in record[2].items():
+            if rule_id not in skip_rules and elapsed > self.pattern_budget:
+                violations.append(self._violation(
+                    file_path, rule_id, f"took {elapsed:.2f}s, over its {self.pattern_budget}s budget"
+                ))
+        return bugs, violations, route_index, record
+
+    def analyze_files(self, files: List[Path]) -> List[Tuple[List[BugReport], List[BugReport], Dict, Optional[Tuple]]]:
+        """Return (bugs, budget violations, route index, profile record) for each file, in input order
+
+        The route index is empty and the profile record None for files that hit the file timeout.
+        """
+        return self.run_jobs([self._file_job(str(file_path)) for file_path in files])
+
+class PatternFuzzer:
+    """Measure the longest adversarial input each rule handles within a time budget.
+
+    Inputs are built from the literals each pattern requires. Besides dense
+    and unterminated runs of those literals, every short run of consecutive
+    literals is "pumped" (repeated) with the pattern's final literal left out,
+    so the engine keeps finding partial matches it has to abandon. All inputs
+    are timed at min_length; the slowest few are then doubled in length until
+    the rule overruns the budget or max_length is reached. Timing runs in
+    GuardedScanner workers, so a runaway pattern is killed.
+    """
+
+    MAX_PUMP_LITERALS = 4
+    KEEP_SLOWEST = 3
+
+    def __init__(self, analyzer: CodeAnalyzer, budget: float = 1.0,
+                 min_length: int = 1024, max_length: int = 4 * 1024 * 1024):
+        self.analyzer = analyzer
+        self.budget = budget
+        self.min_length = min_length
+        self.max_length = max_length
+        self.scanner = GuardedScanner(analyzer, file_timeout=budget, pattern_budget=budget)
+
+    @classmethod
+    def generators(cls, literals: Tuple[str, ...]) -> Dict[str, object]:
+        """Return named functions that build an adversarial input of a given length"""
+        words = list(literals) or ['x']
+
+        def repeat(unit: str, prefix: str = '', suffix: str = ''):
+            def build(length: int) -> str:
+                count = max(1, (length - len(prefix) - len(suffix)) // len(unit) + 1)
+                return (prefix + unit * count)[:max(1, length - len(suffix))] + suffix
+            return build
+
+        dense = ' '.join(words) + ' '
+        generators = {
+            'dense_line': repeat(dense),
+            'dense_lines': repeat(dense.rstrip() + '\n'),
+            'unclosed_literal': repeat(words[1] if len(words) > 1 else '(', prefix=words[0] + ' '),
+            'long_tail': repeat('a', prefix=words[0] + ' '),
+        }
+
+        # Pump words[i:j] between the literals before and after it, dropping
+        # the final literal so no match can complete.
+        head = words[:-1] if len(words) > 1 else words
+        for i in range(len(head)):
+            for j in range(i + 1, min(len(head), i + cls.MAX_PUMP_LITERALS) + 1):
+                prefix = ' '.join(head[:i]) + ' ' if i else ''
+                suffix = ' ' + ' '.join(head[j:]) if j < len(head) else ''
+                generators[f'pump[{i}:{j}]'] = repeat(' '.join(head[i:j]) + ' ', prefix, suffix)
+        return generators
+
+    def _rule_job(self, rule_id: str, literals: Tuple[str, ...]):
+        generators = self.generators(literals)
+        candidates = list(generators)
+        tolerated, worst_input, worst_time = 0, '', 0.0
+        length = self.min_length
+        while length <= self.max_length:
+            timings = []
+            for name in candidates:
+                elapsed = yield ('time_pattern', rule_id, generators[name](length)), self.budget
+                if elapsed is None or elapsed > self.budget:
+                    return {'rule': rule_id, 'tolerated_length': tolerated, 'limit_input': name,
+                            'limit_length': length, 'seconds_at_tolerated': round(worst_time, 4),
+                            'worst_input': worst_input}
+                timings.append((elapsed, name))
+            timings.sort(reverse=True)
+            candidates = [name for _, name in timings[:self.KEEP_SLOWEST]]
+            tolerated, (worst_time, worst_input) = length, timings[0]
+            length *= 2
+        return {'rule': rule_id, 'tolerated_length': tolerated, 'limit_input': None,
+                'limit_length': None, 'seconds_at_tolerated': round(worst_time, 4),
+                'worst_input': worst_input}
+
+    def run(self) -> List[Dict]:
+        """Return one result per rule, in rule order"""
+        jobs = []
+        for rule_id in self.analyzer.all_rule_ids():
+            source = self.scanner.rule_source(rule_id)
+            jobs.append(self._rule_job(rule_id, PatternScanEngine._required_literals(source)))
+        results = self.scanner.run_jobs(jobs)
+        for result in results:
+            result['pattern'] = self.scanner.rule_source(result['rule'])
+        return results
+
+    @staticmethod
+    def format_results(results: List[Dict]) -> str:
+        lines = [f"{'RULE':<26} {'TOLERATED':>10} {'LIMIT AT':>10}  WORST INPUT"]
+        for result in results:
+            limit = result['limit_length'] if result['limit_length'] is not None else '-'
+            lines.append(f"{result['rule']:<26} {result['tolerated_length']:>10} {limit:>10}  "
+                         f"{result['limit_input'] or result['worst_input']}")
+        return "\n".join(lines)
@@ -0,0 +1,107 @@
+"""Per-rule, per-file and per-checker scan profile"""
+
+import json
+from typing import Dict, List, Tuple
+from datetime import datetime
+
+from .constants import DETECTOR_VERSION
+
+class ScanProfile:
+    """Cost accounting for a bug detection run.
+
+    Records wall time, match count and bytes scanned per rule, wall time, size
+    and finding count per file, and wall time per checker. Rule ids look like
+    'sql_injection[0]'; the category is the part before the bracket.
+    """
+
+    def __init__(self):
+        # rule id -> [seconds, matches, bytes scanned, files scanned]
+        self.rules: Dict[str, List[float]] = {}
+        # file path -> [seconds, bytes, findings]
+        self.files: Dict[str, List[float]] = {}
+        # checker name -> seconds
+        self.checkers: Dict[str, float] = {}
+        self.cached_files = 0
+
+    def add_file(self, file_path, record: Tuple, findings: int):
+        """Add one file's (seconds, bytes, rule_stats) record"""
+        seconds, size, rule_stats = record
+        self.files[str(file_path)] = [seconds, size, findings]
+        for rule_id, (rule_seconds, matches, scanned) in rule_stats.items():
+            totals = self.rules.setdefault(rule_id, [0.0, 0, 0, 0])
+            totals[0] += rule_seconds
+            totals[1] += matches
+            totals[2] += scanned
+            totals[3] += 1
+
+    def add_checker(self, name: str, seconds: float):
+        self.checkers[name] = self.checkers.get(name, 0.0) + seconds
+
+    def category_totals(self) -> Dict[str, List[float]]:
+        """Return [seconds, matches, bytes scanned] per rule category"""
+        totals: Dict[str, List[float]] = {}
+        for rule_id, (seconds, matches, scanned, _) in self.rules.items():
+            category = rule_id.split('[', 1)[0]
+            category_totals = totals.setdefault(category, [0.0, 0, 0])
+            category_totals[0] += seconds
+            category_totals[1] += matches
+            category_totals[2] += scanned
+        return totals
+
+    def top_rules(self, count: int) -> List[Tuple[str, List[float]]]:
+        return sorted(self.rules.items(), key=lambda item: (-item[1][0], item[0]))[:count]
+
+    def top_files(self, count: int) -> List[Tuple[str, List[float]]]:
+        return sorted(self.files.items(), key=lambda item: (-item[1][0], item[0]))[:count]
+
+    def to_dict(self, top: int = 10) -> Dict:
+        """Return the profile as JSON-serializable data"""
+        def rule_entry(rule_id, stats):
+            return {'rule': rule_id, 'seconds': round(stats[0], 6), 'matches': stats[1],
+                    'bytes_scanned': stats[2], 'files_scanned': stats[3]}
+
+        def file_entry(path, stats):
+            return {'file': path, 'seconds': round(stats[0], 6), 'bytes': stats[1], 'findings': stats[2]}
+
+        return {
+            'generated': datetime.now().isoformat(timespec='seconds'),
+            'detector_version': DETECTOR_VERSION,
+            'files_analyzed': len(self.files),
+            'files_cached': self.cached_files,
+            'bytes_analyzed': sum(stats[1] for stats in self.files.values()),
+            'checkers': {name: round(seconds, 6) for name, seconds in self.checkers.items()},
+            'categories': {
+                category: {'seconds': round(seconds, 6), 'matches': matches, 'bytes_scanned': scanned}
+                for category, (seconds, matches, scanned) in sorted(self.category_totals().items())
+            },
+            'rules': [rule_entry(rule_id, stats) for rule_id, stats in self.top_rules(len(self.rules))],
+            'top_files': [file_entry(path, stats) for path, stats in self.top_files(top)],
+        }
+
+    def write_json(self, output_path: str, top: int = 10):
+        with open(output_path, 'w') as f:
+            json.dump(self.to_dict(top), f, indent=2)
+
+    def format_lines(self, top: int = 10) -> List[str]:
+        """Return report lines for the slowest rules, categories, files and checkers"""
+        lines = [f"Files analyzed: {len(self.files)} ({self.cached_files} served from cache)"]
+        for name, seconds in self.checkers.items():
+            lines.append(f"Checker {name}: {seconds:.3f}s")
+
+        lines.append("")
+        lines.append(f"Slowest rules (top {top}):")
+        for rule_id, (seconds, matches, scanned, files) in self.top_rules(top):
+            lines.append(f"  {rule_id:<26} {seconds:8.3f}s {matches:7d} matches "
+                         f"{scanned / 1048576:8.2f} MB in {files} files")
+
+        lines.append("")
+        lines.append("Rule categories:")
+        for category, (seconds, matches, scanned) in sorted(self.category_totals().items(),
+                                                            key=lambda item: -item[1][0]):
+            lines.append(f"  {category:<26} {seconds:8.3f}s {matches:7d} matches {scanned / 1048576:8.2f} MB")
+
+        lines.append("")
+        lines.append(f"Slowest files (top {top}):")
+        for path, (seconds, size, findings) in self.top_files(top):
+            lines.append(f"  {seconds:8.3f}s {size:10d} bytes {findings:5d} findings  {path}")
+        return lines
@@ -0,0 +1,357 @@
+"""Streaming text, JSON Lines and SARIF report writers"""
+
+import abc
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple, TextIO, TYPE_CHECKING
+from datetime import datetime
+
+from .constants import DETECTOR_VERSION
+from .findings import RuleInfo, BugReport, group_findings
+from .profiling import ScanProfile
+
+if TYPE_CHECKING:
+    from .api import LoadStats
+
+SEVERITIES = ('critical', 'high', 'medium', 'low')
+
+class ReportWriter(abc.ABC):
+    """Base class for streaming report writers.
+
+    BugDetector.write_report calls begin(), then write_section() once per
+    result category, write_load_results() and write_profile() when those ran,
+    and finally finish(). Findings are written as they are iterated and
+    severity counts are accumulated on the way, so a writer never holds the
+    whole report in memory. With group_by_rule, each section is instead
+    written as one entry per rule listing the files and lines it was found at;
+    that needs the section's findings grouped first.
+    """
+
+    def __init__(self, stream: TextIO, root_path: str = '.', group_by_rule: bool = False):
+        self.stream = stream
+        self.root_path = root_path
+        self.group_by_rule = group_by_rule
+        self.total = 0
+        self.matches = 0
+        self.severity_counts = {severity: 0 for severity in SEVERITIES}
+        self.section_counts: Dict[str, int] = {}
+        # Known findings left out by a baseline
+        self.suppressed = 0
+
+    def _count(self, category: str, bug: BugReport):
+        self.total += 1
+        self.matches += bug.match_count
+        severity = bug.rule.severity
+        self.severity_counts[severity] = self.severity_counts.get(severity, 0) + 1
+        self.section_counts[category] = self.section_counts.get(category, 0) + 1
+
+    def begin(self):
+        pass
+
+    def write_section(self, category: str, bugs: Iterable[BugReport]):
+        if self.group_by_rule:
+            self._write_groups(category, group_findings(bugs))
+        else:
+            self._write_findings(category, bugs)
+
+    @abc.abstractmethod
+    def _write_findings(self, category: str, bugs: Iterable[BugReport]):
+        """Write a section finding by finding, counting each with _count()"""
+
+    @abc.abstractmethod
+    def _write_groups(self, category: str, groups: Dict[RuleInfo, Dict[str, List[BugReport]]]):
+        """Write a section as one entry per rule, counting each finding with _count()"""
+
+    def write_load_results(self, load_results: List['LoadStats'], settings: Dict):
+        pass
+
+    def write_profile(self, profile: 'ScanProfile', top: int):
+        pass
+
+    def finish(self):
+        pass
+
+class TextReportWriter(ReportWriter):
+    """The human-readable report.
+
+    The summary comes first but is only known at the end, so the body is
+    spooled to a temporary file and copied out after the summary in finish().
+    Within a section, findings are spooled per severity the same way.
+    """
+
+    RECOMMENDATIONS = [
+        "1. Fix all CRITICAL and HIGH severity issues immediately",
+        "2. Implement comprehensive input validation",
+        "3. Add proper error handling to all routes",
+        "4. Review and update dependencies regularly",
+        "5. Implement automated testing and CI/CD",
+        "6. Add security headers and HTTPS enforcement",
+        "7. Regular security audits and penetration testing",
+    ]
+
+    def begin(self):
+        self.body = tempfile.TemporaryFile('w+', encoding='utf-8')
+
+    @staticmethod
+    def _lines(out: TextIO, *lines: str):
+        for line in lines:
+            out.write(line)
+            out.write("\n")
+
+    def _write_spooled(self, category: str, entries: Iterable[Tuple[str, str]]):
+        """Write a section from (severity, entry text) pairs, grouped by severity
+
+        Severities outside SEVERITIES follow the known ones under their own
+        headings, in order of first appearance.
+        """
+        spools: Dict[str, TextIO] = {}
+        numbers: Dict[str, int] = {}
+        try:
+            for severity, text in entries:
+                if severity not in spools:
+                    spools[severity] = tempfile.TemporaryFile('w+', encoding='utf-8')
+                numbers[severity] = number = numbers.get(severity, 0) + 1
+                spools[severity].write(f"\n{number}. {text}")
+
+            if not self.section_counts.get(category):
+                return
+            self._lines(self.body, category.upper().replace('_', ' '), "-" * 40)
+            others = [severity for severity in spools if severity not in SEVERITIES]
+            for severity in [*SEVERITIES, *others]:
+                if severity in spools:
+                    self._lines(self.body, "", f"{severity.upper()} SEVERITY:")
+                    spools[severity].seek(0)
+                    shutil.copyfileobj(spools[severity], self.body)
+            self._lines(self.body, "")
+        finally:
+            for spool in spools.values():
+                spool.close()
+
+    def _write_findings(self, category: str, bugs: Iterable[BugReport]):
+        def entries():
+            for bug in bugs:
+                self._count(category, bug)
+                severity, bug_category, description, recommendation = bug.rule
+                lines = [f"{description}\n   File: {bug.file_path}\n"]
+                if bug.line_number > 0:
+                    lines.append(f"   Line: {bug.line_number}\n")
+                lines.append(f"   Category: {bug_category}\n   Recommendation: {recommendation}\n")
+                if bug.match_count > 1:
+                    lines.append(f"   Matches: {bug.match_count}\n")
+                if bug.code_snippet:
+                    lines.append(f"   Code: {bug.code_snippet}\n")
+                yield severity, ''.join(lines)
+
+        self._write_spooled(category, entries())
+
+    def _write_groups(self, category: str, groups: Dict[RuleInfo, Dict[str, List[BugReport]]]):
+        def entries():
+            for rule, files in groups.items():
+                findings = matches = 0
+                locations = []
+                for file_path, file_bugs in files.items():
+                    for bug in file_bugs:
+                        self._count(category, bug)
+                        findings += 1
+                        matches += bug.match_count
+                    lines = sorted({bug.line_number for bug in file_bugs if bug.line_number > 0})
+                    if lines:
+                        label = 'line' if len(lines) == 1 else 'lines'
+                        locations.append(f"   - {file_path}: {label} {', '.join(map(str, lines))}\n")
+                    else:
+                        locations.append(f"   - {file_path}\n")
+                yield rule.severity, (
+                    f"{rule.description}\n   Category: {rule.category}\n   Recommendation: {rule.recommendation}\n"
+                    f"   Occurrences: {findings} findings, {matches} matches in {len(files)} files\n"
+                    + ''.join(locations)
+                )
+
+        self._write_spooled(category, entries())
+
+    def write_load_results(self, load_results: List['LoadStats'], settings: Dict):
+        self._lines(self.body, "LOAD TEST", "-" * 40)
+        if settings['rate']:
+            self._lines(self.body, f"{settings['rate']:g} req/s per endpoint (at most {settings['concurrency']} "
+                                   f"in flight) for {settings['duration']:g}s")
+        else:
+            self._lines(self.body, f"{settings['concurrency']} concurrent requests per endpoint "
+                                   f"for {settings['duration']:g}s")
+        for stats in load_results:
+            self._lines(self.body, "", f"{stats.method} {stats.url}", f"   {stats.format_line()}")
+        self._lines(self.body, "")
+
+    def write_profile(self, profile: 'ScanProfile', top: int):
+        self._lines(self.body, "PROFILE", "-" * 40, *profile.format_lines(top), "")
+
+    def finish(self):
+        self._lines(
+            self.stream,
+            "=" * 80,
+            "DREAM-SVN BACKEND BUG DETECTION REPORT",
+            "=" * 80,
+            f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            "",
+            "SUMMARY",
+            "-" * 40,
+            f"Total Issues Found: {self.total}",
+            f"Critical: {self.severity_counts['critical']}",
+            f"High: {self.severity_counts['high']}",
+            f"Medium: {self.severity_counts['medium']}",
+            f"Low: {self.severity_counts['low']}",
+            *(f"{severity.capitalize()}: {count}" for severity, count in self.severity_counts.items()
+              if severity not in SEVERITIES),
+        )
+        if self.matches != self.total:
+            self._lines(self.stream, f"Pattern matches behind these issues: {self.matches}")
+        if self.suppressed:
+            self._lines(self.stream, f"Known issues suppressed by baseline: {self.suppressed}")
+        self._lines(self.stream, "")
+        self.body.seek(0)
+        shutil.copyfileobj(self.body, self.stream)
+        self.body.close()
+        self._lines(self.stream, "RECOMMENDED ACTIONS", "-" * 40, *self.RECOMMENDATIONS)
+
+class JsonLinesReportWriter(ReportWriter):
+    """One JSON object per line: a run header, one 'finding' record per
+    finding (or one 'rule_group' record per rule with group_by_rule),
+    'load_test' and 'profile' records, and a closing 'summary'"""
+
+    def _record(self, record: Dict):
+        self.stream.write(json.dumps(record))
+        self.stream.write("\n")
+
+    def begin(self):
+        self._record({'type': 'run', 'tool': 'bug_detector', 'version': DETECTOR_VERSION,
+                      'root': str(self.root_path), 'generated': datetime.now().isoformat(timespec='seconds')})
+
+    def _write_findings(self, category: str, bugs: Iterable[BugReport]):
+        for bug in bugs:
+            self._count(category, bug)
+            record = {'type': 'finding', 'section': category}
+            record.update(bug.to_dict())
+            self._record(record)
+
+    def _write_groups(self, category: str, groups: Dict[RuleInfo, Dict[str, List[BugReport]]]):
+        for rule, files in groups.items():
+            record = {'type': 'rule_group', 'section': category}
+            record.update(rule._asdict())
+            record['findings'] = record['matches'] = 0
+            record['locations'] = []
+            for file_path, file_bugs in files.items():
+                for bug in file_bugs:
+                    self._count(category, bug)
+                    record['findings'] += 1
+                    record['matches'] += bug.match_count
+                record['locations'].append({'file_path': file_path,
+                                            'lines': sorted(bug.line_number for bug in file_bugs)})
+            self._record(record)
+
+    def write_load_results(self, load_results: List['LoadStats'], settings: Dict):
+        for stats in load_results:
+            record = {'type': 'load_test'}
+            record.update(settings)
+            record.update(stats.summary())
+            self._record(record)
+
+    def write_profile(self, profile: 'ScanProfile', top: int):
+        record = {'type': 'profile'}
+        record.update(profile.to_dict(top))
+        self._record(record)
+
+    def finish(self):
+        self._record({'type': 'summary', 'total': self.total, 'matches': self.matches,
+                      'suppressed': self.suppressed, 'by_severity': self.severity_counts,
+                      'by_section': self.section_counts})
+
+class SarifReportWriter(ReportWriter):
+    """SARIF 2.1.0 log with one result per finding.
+
+    The document is written by hand around the results array so results can
+    be streamed; load test and profile data go into the run's properties.
+    Results stay one per location under group_by_rule, as code scanning
+    tools expect.
+    """
+
+    LEVELS = {'critical': 'error', 'high': 'error', 'medium': 'warning', 'low': 'note'}
+
+    def begin(self):
+        self.first_result = True
+        self.properties: Dict = {}
+        root_uri = Path(self.root_path).resolve().as_uri() + '/'
+        head = {
+            'tool': {'driver': {'name': 'bug_detector', 'version': DETECTOR_VERSION,
+                                'informationUri': 'https://github.com/meghanandan/dream'}},
+            'originalUriBaseIds': {'%SRCROOT%': {'uri': root_uri}},
+        }
+        self.stream.write('{"$schema": "https://json.schemastore.org/sarif-2.1.0.json", "version": "2.1.0", '
+                          '"runs": [')
+        # Leave the run object open so the results array can follow
+        self.stream.write(json.dumps(head)[:-1])
+        self.stream.write(', "results": [\n')
+
+    def _location(self, bug: BugReport) -> Dict:
+        if '://' in bug.file_path:
+            artifact = {'uri': bug.file_path}
+        else:
+            try:
+                artifact = {'uri': Path(bug.file_path).resolve().relative_to(Path(self.root_path).resolve()).as_posix(),
+                            'uriBaseId': '%SRCROOT%'}
+            except ValueError:
+                artifact = {'uri': Path(bug.file_path).resolve().as_uri()}
+        physical = {'artifactLocation': artifact}
+        if bug.line_number > 0:
+            region = {'startLine': bug.line_number, 'endLine': max(bug.end_line_number, bug.line_number)}
+            if bug.column_number > 0:
+                region['startColumn'] = bug.column_number
+            if bug.code_snippet:
+                region['snippet'] = {'text': bug.code_snippet}
+            physical['region'] = region
+        return {'physicalLocation': physical}
+
+    def _write_findings(self, category: str, bugs: Iterable[BugReport]):
+        for bug in bugs:
+            self._count(category, bug)
+            result = {
+                'ruleId': bug.category,
+                'level': self.LEVELS.get(bug.severity, 'warning'),
+                'message': {'text': bug.description},
+                'locations': [self._location(bug)],
+                'properties': {'severity': bug.severity, 'section': category,
+                               'recommendation': bug.recommendation, 'matchCount': bug.match_count},
+            }
+            if not self.first_result:
+                self.stream.write(',\n')
+            self.first_result = False
+            self.stream.write(json.dumps(result))
+
+    def _write_groups(self, category: str, groups: Dict[RuleInfo, Dict[str, List[BugReport]]]):
+        # Grouping only orders the results; each location is still its own result
+        self._write_findings(category, (bug for files in groups.values()
+                                        for file_bugs in files.values() for bug in file_bugs))
+
+    def write_load_results(self, load_results: List['LoadStats'], settings: Dict):
+        self.properties['loadTest'] = {'settings': settings,
+                                       'endpoints': [stats.summary() for stats in load_results]}
+
+    def write_profile(self, profile: 'ScanProfile', top: int):
+        self.properties['profile'] = profile.to_dict(top)
+
+    def finish(self):
+        self.properties['summary'] = {'total': self.total, 'suppressed': self.suppressed,
+                                      'bySeverity': self.severity_counts, 'bySection': self.section_counts}
+        self.stream.write('\n], "properties": ')
+        self.stream.write(json.dumps(self.properties))
+        self.stream.write('}]}\n')
+
+REPORT_WRITERS = {
+    'text': TextReportWriter,
+    'jsonl': JsonLinesReportWriter,
+    'sarif': SarifReportWriter,
+}
+DEFAULT_REPORT_FILES = {
+    'text': 'bug_detection_report.txt',
+    'jsonl': 'bug_detection_report.jsonl',
+    'sarif': 'bug_detection_report.sarif',
+}
@@ -0,0 +1,124 @@
+"""Express route index built from the static scan"""
+
+import os
+import re
+from typing import Dict, List, Tuple, Optional
+
+from .findings import Endpoint
+from .source import LineIndex
+from .engine import as_bytes_pattern
+
+class RouteIndexer:
+    """Express route definitions and router mounts, indexed per file.
+
+    index() runs during the static scan over content that has already been
+    read, and returns a small JSON-friendly dict that is cached with the
+    file's findings. catalogue() then joins the per-file indexes: a route in
+    a router module gets the prefix of every app.use('/prefix', router) that
+    mounts it, following relative require() calls between files.
+    """
+
+    ROUTE = re.compile(
+        r'^[ \t]*(\w+)\.(get|post|put|delete|patch|all)\s*\(\s*([\'"`])([^\'"`\n]*)\3', re.MULTILINE
+    )
+    MOUNT = re.compile(
+        r'^[ \t]*(\w+)\.use\s*\(\s*([\'"`])([^\'"`\n]*)\2\s*,\s*(?:[\w.]+\s*,\s*)*(\w+)\s*\)', re.MULTILINE
+    )
+    REQUIRE = re.compile(
+        r'\b(?:const|let|var)\s+(\w+)\s*=\s*require\s*\(\s*([\'"])(\.{1,2}/[^\'"\n]+)\2\s*\)'
+    )
+    ROUTER = re.compile(r'\b(\w+)\s*=\s*(?:express\s*\(\s*\)|(?:express\s*\.\s*)?Router\s*\()')
+    DEFAULT_ROUTERS = frozenset({'app', 'router'})
+
+    _byte_patterns: Dict[str, re.Pattern] = {}
+
+    @classmethod
+    def patterns(cls) -> List[str]:
+        return [cls.ROUTE.pattern, cls.MOUNT.pattern, cls.REQUIRE.pattern, cls.ROUTER.pattern]
+
+    @classmethod
+    def _finditer(cls, name: str, content):
+        """Yield the groups of each match, decoded to str for bytes content"""
+        compiled = getattr(cls, name)
+        if isinstance(content, str):
+            for match in compiled.finditer(content):
+                yield match.start(), match.groups()
+            return
+        if name not in cls._byte_patterns:
+            cls._byte_patterns[name] = as_bytes_pattern(compiled)
+        for match in cls._byte_patterns[name].finditer(content):
+            yield match.start(), tuple(group.decode('ascii') for group in match.groups())
+
+    @classmethod
+    def index(cls, content, line_index: LineIndex) -> Dict[str, List]:
+        """Return {'routes': [[method, path, line]], 'mounts': [[prefix, name]],
+        'requires': [[name, spec]]} for one file; empty if it defines no routes or mounts"""
+        routers = set(cls.DEFAULT_ROUTERS)
+        routers.update(groups[0] for _, groups in cls._finditer('ROUTER', content))
+
+        routes = [
+            [method.upper(), path, line_index.line_of(start)]
+            for start, (obj, method, _, path) in cls._finditer('ROUTE', content)
+            if obj in routers
+        ]
+        mounts = [
+            [prefix, name]
+            for _, (obj, _, prefix, name) in cls._finditer('MOUNT', content)
+            if obj in routers
+        ]
+        if not routes and not mounts:
+            return {}
+        requires = [[name, spec] for _, (name, _, spec) in cls._finditer('REQUIRE', content)]
+        return {'routes': routes, 'mounts': mounts, 'requires': requires}
+
+    @staticmethod
+    def _resolve(file_path: str, spec: str, known: Dict[str, Dict]) -> Optional[str]:
+        """Resolve a relative require() spec to one of the indexed files"""
+        base = os.path.normpath(os.path.join(os.path.dirname(file_path), spec))
+        for candidate in (base, base + '.js', os.path.join(base, 'index.js')):
+            if candidate in known:
+                return candidate
+        return None
+
+    @staticmethod
+    def _join(prefix: str, path: str) -> str:
+        joined = prefix.rstrip('/') + '/' + path.lstrip('/')
+        return joined if joined == '/' else joined.rstrip('/') or '/'
+
+    @classmethod
+    def catalogue(cls, route_indexes: Dict[str, Dict]) -> List[Endpoint]:
+        """Join per-file indexes into a sorted list of endpoints with full paths"""
+        # mounted file -> [(mounting file, prefix)]
+        mounted_by: Dict[str, List[Tuple[str, str]]] = {}
+        for file_path, index in route_indexes.items():
+            requires = dict(index.get('requires', []))
+            for prefix, name in index.get('mounts', []):
+                if name not in requires:
+                    continue
+                target = cls._resolve(file_path, requires[name], route_indexes)
+                if target is not None and target != file_path:
+                    mounted_by.setdefault(target, []).append((file_path, prefix))
+
+        def prefixes(file_path: str, seen: frozenset) -> List[str]:
+            parents = [(parent, prefix) for parent, prefix in mounted_by.get(file_path, [])
+                       if parent not in seen]
+            if not parents:
+                return ['']
+            result = []
+            for parent, prefix in parents:
+                for outer in prefixes(parent, seen | {parent}):
+                    result.append(cls._join(outer, prefix))
+            return result
+
+        endpoints = set()
+        for file_path, index in route_indexes.items():
+            routes = index.get('routes', [])
+            if not routes:
+                continue
+            file_prefixes = prefixes(file_path, frozenset({file_path}))
+            for method, path, line in routes:
+                for prefix in file_prefixes:
+                    endpoints.add((method, cls._join(prefix, path), file_path, line))
+
+        return [Endpoint(*endpoint) for endpoint in
+                sorted(endpoints, key=lambda item: (item[2], item[3], item[1], item[0]))]
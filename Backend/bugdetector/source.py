@@ -0,0 +1,451 @@
+"""Offset-preserving views of JavaScript source: line index, token masks, brace tree"""
+
+import re
+import heapq
+import string
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple, Optional
+
+from .constants import MAX_SNIPPET_CHARS
+
+class LineIndex:
+    """Offset to line/column lookup for a single file.
+
+    Line start offsets are collected once per file, after which every lookup
+    is a binary search instead of slicing and counting newlines in the prefix.
+    content may also be an ASCII bytes-like buffer (for example an mmap), in
+    which case line_text decodes only the requested line.
+    """
+
+    def __init__(self, content):
+        self.content = content
+        self.is_text = isinstance(content, str)
+        self.line_starts = [0]
+        newline = '\n' if self.is_text else b'\n'
+        find = content.find
+        pos = find(newline)
+        while pos != -1:
+            self.line_starts.append(pos + 1)
+            pos = find(newline, pos + 1)
+
+    def __len__(self) -> int:
+        return len(self.line_starts)
+
+    def line_of(self, offset: int) -> int:
+        """Return the 1-based line number containing offset"""
+        return bisect_right(self.line_starts, offset)
+
+    def position(self, offset: int) -> Tuple[int, int]:
+        """Return the 1-based (line, column) of offset"""
+        line = bisect_right(self.line_starts, offset)
+        return line, offset - self.line_starts[line - 1] + 1
+
+    def span(self, start: int, end: int) -> Tuple[int, int, int]:
+        """Return (line, column, end_line) for the half-open range [start, end)"""
+        line, column = self.position(start)
+        end_line = self.line_of(end - 1) if end > start else line
+        return line, column, end_line
+
+    def line_text(self, line: int) -> str:
+        """Return the text of a 1-based line without its trailing newline"""
+        if line < 1 or line > len(self.line_starts):
+            return ""
+        start = self.line_starts[line - 1]
+        if line < len(self.line_starts):
+            text = self.content[start:self.line_starts[line] - 1]
+        else:
+            text = self.content[start:len(self.content)]
+        return text if self.is_text else text.decode('ascii')
+
+    def _bounds(self, line: int) -> Tuple[int, int]:
+        """Return the [start, end) offsets of a 1-based line without its newline"""
+        if line < 1 or line > len(self.line_starts):
+            return 0, 0
+        start = self.line_starts[line - 1]
+        return start, self.line_starts[line] - 1 if line < len(self.line_starts) else len(self.content)
+
+    def line_length(self, line: int) -> int:
+        """Return the length of a 1-based line without its newline"""
+        start, end = self._bounds(line)
+        return end - start
+
+    def snippet(self, line: int, column: int = 1, limit: int = MAX_SNIPPET_CHARS) -> str:
+        """Return the stripped text of a line, at most about limit characters long
+
+        Longer lines are cut to a window that starts a little before column,
+        with '...' marking the cut ends. Only the window is copied, so a
+        multi-megabyte minified line costs no more than a short one.
+        """
+        start, end = self._bounds(line)
+        if end - start > limit:
+            first = min(max(start, start + column - 1 - limit // 4), end - limit)
+            text = self.content[first:first + limit]
+            text = text if self.is_text else text.decode('ascii')
+            return ('...' if first > start else '') + text.strip() + ('...' if first + limit < end else '')
+        text = self.content[start:end]
+        return (text if self.is_text else text.decode('ascii')).strip()
+
+class JsSourceViews:
+    """Offset-preserving views of a JavaScript file for scoped rules.
+
+    One pass over the text finds comments and the bodies of string, template
+    and regex literals. Each view blanks what its scope should not see with
+    spaces and keeps newlines, so offsets, line numbers and columns are those
+    of the original text:
+
+      'code'     comments and string and template bodies blanked; the
+                 delimiters stay
+      'strings'  everything but string and template bodies blanked
+      'all'      comments blanked
+      'raw'      the text as read
+
+    Regex literal bodies are only skipped so that quotes inside them do not
+    open strings; the pattern scopes see them as before. The BraceTree is
+    built from the code view with regex bodies blanked as well, so a brace
+    in a regex does not open a block. Views and the tree are built on first
+    use.
+
+    content may also be an ASCII bytes-like buffer (a memory-mapped large
+    file). It is tokenized with bytes versions of the same patterns and its
+    views are bytes, so a file gets the same findings on either path.
+    """
+
+    SCOPES = ('code', 'strings', 'all', 'raw')
+
+    # Groups: 1 comment, 2/3 string body, 4 template body up to `, ${ or the
+    # end, 5 the ${ that opens a substitution, 6 a brace inside one. A lone /
+    # may start a regex literal.
+    _BODY = r'([^`\\$]*(?:(?:\\[\s\S]|\$(?!\{))[^`\\$]*)*)(?:(\$\{)|`)?'
+    _TOKEN = (r'(//[^\n]*|/\*[^*]*(?:\*(?!/)[^*]*)*(?:\*/)?)'
+              r'|"([^"\\\n]*(?:\\[\s\S][^"\\\n]*)*)"?'
+              r"|'([^'\\\n]*(?:\\[\s\S][^'\\\n]*)*)'?"
+              r'|`' + _BODY + r'|/')
+    CODE_TOKEN = re.compile(_TOKEN)
+    SUBSTITUTION_TOKEN = re.compile(_TOKEN + r'|([{}])')
+    # The rest of a template literal after a substitution, grouped like CODE_TOKEN
+    TEMPLATE_REST = re.compile(r'()()()' + _BODY)
+    REGEX_LITERAL = re.compile(r'/(?:[^/\\\n\[]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/')
+    # A regex literal can only follow one of these characters
+    REGEX_PRECEDERS = frozenset('(,=:[!&|?{};')
+    # CODE_TOKEN, SUBSTITUTION_TOKEN, TEMPLATE_REST and REGEX_LITERAL for bytes content
+    BYTES_TOKENS = tuple(re.compile(pattern.pattern.encode('ascii'))
+                         for pattern in (CODE_TOKEN, SUBSTITUTION_TOKEN, TEMPLATE_REST, REGEX_LITERAL))
+    # Bumped when the views change without a change to the patterns above
+    REVISION = 3
+
+    def __init__(self, content):
+        self.content = content
+        self.is_text = isinstance(content, str)
+        self._views: Dict[str, object] = {'raw': content}
+        self._spans: Optional[Tuple[List[Tuple[int, int]], ...]] = None
+        self._tree: Optional['BraceTree'] = None
+
+    @classmethod
+    def patterns(cls) -> List[str]:
+        return [cls.SUBSTITUTION_TOKEN.pattern, cls.REGEX_LITERAL.pattern, ''.join(sorted(cls.REGEX_PRECEDERS)),
+                str(cls.REVISION)]
+
+    def text(self, scope: str):
+        """Return the view of the content for a rule scope"""
+        view = self._views.get(scope)
+        if view is not None:
+            return view
+        comments, strings, _ = self.spans()
+        if scope == 'code':
+            view = self._blank(heapq.merge(comments, strings))
+        elif scope == 'strings':
+            view = self._blank(self._gaps(strings))
+        elif scope == 'all':
+            view = self._blank(comments)
+        else:
+            raise ValueError(f"Unknown rule scope {scope!r}; expected one of {self.SCOPES}")
+        self._views[scope] = view
+        return view
+
+    def tree(self) -> 'BraceTree':
+        """Return the block structure of the code view, shared by every structural check"""
+        if self._tree is None:
+            comments, strings, regexes = self.spans()
+            code = self._blank(heapq.merge(comments, strings, regexes))
+            self._tree = BraceTree(code if self.is_text else code.decode('ascii'))
+        return self._tree
+
+    def spans(self) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]], List[Tuple[int, int]]]:
+        """Return the sorted (start, end) ranges of comments, of string and
+        template bodies, and of regex literal bodies"""
+        if self._spans is None:
+            self._spans = self._tokenize()
+        return self._spans
+
+    def _tokenize(self) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]], List[Tuple[int, int]]]:
+        content = self.content
+        comments: List[Tuple[int, int]] = []
+        strings: List[Tuple[int, int]] = []
+        regexes: List[Tuple[int, int]] = []
+        if self.is_text:
+            code_token, substitution_token = self.CODE_TOKEN, self.SUBSTITUTION_TOKEN
+            template_rest, regex_literal = self.TEMPLATE_REST, self.REGEX_LITERAL
+            open_brace, blanks, preceders = '{', ' \t', self.REGEX_PRECEDERS
+        else:
+            code_token, substitution_token, template_rest, regex_literal = self.BYTES_TOKENS
+            # Indexing bytes gives ints, which `in` finds in a bytes object
+            open_brace, blanks, preceders = b'{', b' \t', ''.join(self.REGEX_PRECEDERS).encode('ascii')
+        # Open braces inside each enclosing ${...} substitution
+        substitutions: List[int] = []
+        pos = 0
+        while True:
+            token = (substitution_token if substitutions else code_token).search(content, pos)
+            if token is None:
+                break
+            kind = token.lastindex
+            pos = token.end()
+            if kind == 1:
+                comments.append(token.span())
+            elif kind == 6:
+                if token.group() == open_brace:
+                    substitutions[-1] += 1
+                elif substitutions[-1]:
+                    substitutions[-1] -= 1
+                else:
+                    substitutions.pop()
+                    token = template_rest.match(content, pos)
+                    pos = token.end()
+                    strings.append(token.span(4))
+                    if token.group(5):
+                        substitutions.append(0)
+            elif kind is not None:
+                strings.append(token.span(kind if kind < 4 else 4))
+                if kind == 5:
+                    substitutions.append(0)
+            else:
+                # A lone slash: division unless it follows an operator
+                before = token.start() - 1
+                while before >= 0 and content[before] in blanks:
+                    before -= 1
+                if before < 0 or content[before] in preceders:
+                    literal = regex_literal.match(content, token.start())
+                    if literal:
+                        pos = literal.end()
+                        regexes.append((token.start() + 1, pos - 1))
+        return comments, strings, regexes
+
+    def _gaps(self, spans: List[Tuple[int, int]]) -> Iterable[Tuple[int, int]]:
+        """Yield the ranges of the content not covered by spans"""
+        last = 0
+        for start, end in spans:
+            if start > last:
+                yield last, start
+            last = end
+        if last < len(self.content):
+            yield last, len(self.content)
+
+    def _blank(self, spans: Iterable[Tuple[int, int]]):
+        """Return the content with every range in spans replaced by spaces, keeping newlines"""
+        content = self.content
+        space, newline = (' ', '\n') if self.is_text else (b' ', b'\n')
+        pieces = []
+        last = 0
+        for start, end in spans:
+            if start == end:
+                continue
+            pieces.append(content[last:start])
+            masked = content[start:end]
+            if newline in masked:
+                pieces.append(newline.join(space * len(part) for part in masked.split(newline)))
+            else:
+                pieces.append(space * (end - start))
+            last = end
+        pieces.append(content[last:len(content)])
+        return space[:0].join(pieces)
+
+@dataclass
+class Block:
+    """A {...} block of a BraceTree"""
+    kind: str  # 'loop', 'try', 'catch', 'finally', 'function' or 'block'
+    header: int  # offset of the keyword or parameters the block belongs to
+    start: int  # offset of '{'
+    index: int  # position in BraceTree.blocks
+    parent: Optional['Block'] = None
+    end: int = -1  # offset just past the matching '}'
+    children: List['Block'] = field(default_factory=list)
+
+class BraceTree:
+    """Block structure of a JavaScript file, for the structural checks.
+
+    Built in one pass over the braces of the JsSourceViews code view with
+    regex bodies blanked too, so braces and parentheses inside comments and
+    literals are already gone. Each block is classified by what precedes its '{' (a loop or catch
+    header, an arrow, a try, ...). blocks lists every block in source order,
+    so the descendants of a block are the contiguous run that follows it and
+    the checks below are linear walks.
+    """
+
+    BRACE = re.compile(r'[{}]')
+    CALL_TOKEN = re.compile(r'[(){]')
+    WORD_CHARS = string.ascii_letters + string.digits + '_$'
+    # Characters looked back over at a time when classifying a block
+    WINDOW = 64
+    LOOP_KEYWORDS = frozenset({'for', 'while'})
+    STATEMENT_KEYWORDS = frozenset({'if', 'switch', 'with', 'else', 'return'})
+
+    def __init__(self, code: str):
+        self.code = code
+        self.blocks: List[Block] = []
+        self.roots: List[Block] = []
+        self._by_start: Optional[Dict[int, Block]] = None
+        self._parse()
+
+    def _parse(self):
+        code = self.code
+        blocks = self.blocks
+        open_blocks: List[Block] = []
+        for token in self.BRACE.finditer(code):
+            pos = token.start()
+            if code[pos] == '{':
+                kind, header = self._classify(pos)
+                parent = open_blocks[-1] if open_blocks else None
+                block = Block(kind, header, pos, len(blocks), parent)
+                (parent.children if parent else self.roots).append(block)
+                blocks.append(block)
+                open_blocks.append(block)
+            elif open_blocks:
+                open_blocks.pop().end = pos + 1
+        for block in open_blocks:
+            block.end = len(code)
+
+    def _opener(self, close: int) -> int:
+        """Return the offset of the '(' matching the ')' at close, or -1"""
+        code = self.code
+        depth = 1
+        pos = close
+        while depth:
+            opening = code.rfind('(', 0, pos)
+            if opening < 0:
+                return -1
+            closing = code.rfind(')', opening, pos)
+            if closing < 0:
+                depth -= 1
+                pos = opening
+            else:
+                depth += 1
+                pos = closing
+        return pos
+
+    def _skip_space(self, pos: int) -> int:
+        """Return the offset of the last non-space character before pos, or -1"""
+        code = self.code
+        while pos > 0:
+            window_start = max(0, pos - self.WINDOW)
+            window = code[window_start:pos].rstrip()
+            if window:
+                return window_start + len(window) - 1
+            pos = window_start
+        return -1
+
+    def _word_before(self, pos: int) -> Tuple[int, str]:
+        """Return (start, identifier) ending just before pos, skipping spaces"""
+        end = self._skip_space(pos) + 1
+        window = self.code[max(0, end - self.WINDOW):end]
+        word = window[len(window.rstrip(self.WORD_CHARS)):]
+        return end - len(word), word
+
+    def _classify(self, brace: int) -> Tuple[str, int]:
+        """Return (kind, header offset) for the block opened at brace"""
+        code = self.code
+        last = self._skip_space(brace)
+        if last < 0:
+            return 'block', brace
+        if code[last] == ')':
+            opener = self._opener(last)
+            if opener < 0:
+                return 'block', last
+            start, word = self._word_before(opener)
+            if word in self.LOOP_KEYWORDS:
+                return 'loop', start
+            if word == 'catch':
+                return 'catch', start
+            if not word or word in self.STATEMENT_KEYWORDS:
+                return 'block', start if word else opener
+            # function name(...) { or a method definition name(...) {
+            return 'function', start
+        if code[last] == '>' and code[last - 1:last + 1] == '=>':
+            params = self._skip_space(last - 1)
+            if params >= 0 and code[params] == ')':
+                opener = self._opener(params)
+                if opener >= 0:
+                    return 'function', opener
+            return 'function', self._word_before(last - 1)[0]
+        start, word = self._word_before(brace)
+        if word in ('try', 'finally'):
+            return word, start
+        if word == 'do':
+            return 'loop', start
+        return 'block', start if word else brace
+
+    def descendants(self, block: Block) -> Iterable[Block]:
+        """Yield the blocks nested in block, in source order"""
+        blocks = self.blocks
+        for index in range(block.index + 1, len(blocks)):
+            if blocks[index].start >= block.end:
+                break
+            yield blocks[index]
+
+    def loop_nests(self, depth: int) -> List[Block]:
+        """Return the outermost loop of each nest of at least depth loops"""
+        # Loop nesting height of every block, computed children first
+        heights = [0] * len(self.blocks)
+        for block in reversed(self.blocks):
+            height = max((heights[child.index] for child in block.children), default=0)
+            heights[block.index] = height + (block.kind == 'loop')
+
+        # Whether each block is inside a loop, computed parents first
+        in_loop = [False] * len(self.blocks)
+        nests = []
+        for block in self.blocks:
+            parent = block.parent
+            if parent is not None:
+                in_loop[block.index] = in_loop[parent.index] or parent.kind == 'loop'
+            if block.kind == 'loop' and heights[block.index] >= depth and not in_loop[block.index]:
+                nests.append(block)
+        return nests
+
+    def block_at(self, start: int) -> Optional[Block]:
+        """Return the block whose '{' is at start"""
+        if self._by_start is None:
+            self._by_start = {block.start: block for block in self.blocks}
+        return self._by_start.get(start)
+
+    def arguments(self, opener: int) -> List[Block]:
+        """Return the function blocks passed directly as arguments of the call whose '(' is at opener"""
+        code = self.code
+        functions = []
+        depth = 0
+        pos = opener
+        while True:
+            token = self.CALL_TOKEN.search(code, pos)
+            if token is None:
+                break
+            pos = token.end()
+            char = token.group()
+            if char == '(':
+                depth += 1
+            elif char == ')':
+                depth -= 1
+                if depth == 0:
+                    break
+            else:
+                block = self.block_at(token.start())
+                if block is None:
+                    break
+                if depth == 1 and block.kind == 'function':
+                    functions.append(block)
+                # Parentheses inside the block balance out; skip it whole
+                pos = block.end
+        return functions
+
+    def handles_errors(self, block: Block) -> bool:
+        """Whether block contains a try/catch or a .catch() call"""
+        if '.catch' in self.code[block.start:block.end]:
+            return True
+        return any(inner.kind in ('try', 'catch') for inner in self.descendants(block))
@@ -0,0 +1,145 @@
+"""Single-pass project walker that prunes ignored directories"""
+
+import os
+import logging
+from pathlib import Path
+from typing import Dict, List, Tuple, Optional
+from fnmatch import fnmatchcase
+
+logger = logging.getLogger(__name__)
+
+class ProjectWalker:
+    """Single-pass directory walker shared by the static checkers.
+
+    Ignored directories are pruned before they are entered rather than
+    filtered out afterwards, and every file is classified into the buckets
+    the checkers need during the same traversal. Directory-ignore rules come
+    from DEFAULT_IGNORED_DIRS plus any .gitignore files found under the root;
+    .gitignore rules only prune directories, so ignored files such as
+    .env.local are still visible to the config checks. As in git, the last
+    matching rule decides and a !negation re-includes a directory, but
+    nothing inside a pruned directory is re-included.
+    """
+
+    DEFAULT_IGNORED_DIRS = frozenset({
+        'node_modules', '.git', '.hg', '.svn',
+        'dist', 'build', 'coverage', '.next', '.vite', '.cache', '__pycache__'
+    })
+
+    # bucket name -> file name glob
+    BUCKETS = {
+        'js': '*.js',
+        'package_json': 'package.json',
+        'env': '.env*',
+    }
+
+    def __init__(self, root_path: str, ignored_dirs: Optional[set] = None, use_gitignore: bool = True):
+        self.root_path = Path(root_path)
+        self.ignored_dirs = set(self.DEFAULT_IGNORED_DIRS if ignored_dirs is None else ignored_dirs)
+        self.use_gitignore = use_gitignore
+        self._buckets: Optional[Dict[str, List[Path]]] = None
+        # Every directory visited by walk(), in visiting order
+        self.directories: List[str] = []
+
+    @staticmethod
+    def _read_gitignore(directory: str) -> List[Tuple[str, bool, bool]]:
+        """Return (pattern, anchored, negated) directory rules from directory/.gitignore"""
+        rules = []
+        try:
+            with open(os.path.join(directory, '.gitignore'), 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line or line.startswith('#'):
+                        continue
+                    negated = line.startswith('!')
+                    if negated:
+                        line = line[1:]
+                    line = line.rstrip('/')
+                    if line.startswith('**/'):
+                        line = line[3:]
+                    anchored = '/' in line
+                    line = line.lstrip('/')
+                    if line:
+                        rules.append((line, anchored, negated))
+        except OSError:
+            pass
+        return rules
+
+    def _is_ignored_dir(self, name: str, rel_path: str,
+                        rule_stack: List[Tuple[str, List[Tuple[str, bool, bool]]]]) -> bool:
+        if name in self.ignored_dirs:
+            return True
+        ignored = False
+        for base, rules in rule_stack:
+            local = rel_path[len(base) + 1:] if base else rel_path
+            depth = local.count('/')
+            for pattern, anchored, negated in rules:
+                # Only rules that would change the outcome need matching
+                if ignored != negated:
+                    continue
+                if anchored:
+                    # fnmatch's * also matches /, so without ** a path pattern
+                    # only applies to paths with as many components
+                    if '**' not in pattern and pattern.count('/') != depth:
+                        continue
+                    if fnmatchcase(local, pattern):
+                        ignored = not negated
+                elif fnmatchcase(name, pattern):
+                    ignored = not negated
+        return ignored
+
+    def walk(self) -> Dict[str, List[Path]]:
+        """Walk the tree once and return files grouped by bucket
+
+        Entries are visited in sorted order so the result does not depend on
+        the file system's directory order. The result is computed once and
+        reused by later calls.
+        """
+        if self._buckets is not None:
+            return self._buckets
+
+        buckets: Dict[str, List[Path]] = {name: [] for name in self.BUCKETS}
+        bucket_globs = list(self.BUCKETS.items())
+
+        # Stack of (directory, relative path, gitignore rule stack)
+        stack = [(str(self.root_path), '', [])]
+        while stack:
+            directory, rel_dir, rule_stack = stack.pop()
+            if self.use_gitignore:
+                rules = self._read_gitignore(directory)
+                if rules:
+                    rule_stack = rule_stack + [(rel_dir, rules)]
+
+            try:
+                with os.scandir(directory) as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+            except OSError as e:
+                logger.debug(f"Cannot read directory {directory}: {e}")
+                continue
+            self.directories.append(directory)
+
+            subdirs = []
+            for entry in entries:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not self._is_ignored_dir(entry.name, rel_path, rule_stack):
+                            subdirs.append((entry.path, rel_path, rule_stack))
+                        continue
+                    if not entry.is_file():
+                        continue
+                except OSError:
+                    continue
+                for bucket, pattern in bucket_globs:
+                    if fnmatchcase(entry.name, pattern):
+                        buckets[bucket].append(Path(entry.path))
+
+            # Reversed so subdirectories are popped, and therefore listed, in name order
+            stack.extend(reversed(subdirs))
+
+        self._buckets = buckets
+        return buckets
+
+    def files(self, bucket: str) -> List[Path]:
+        """Return the files in one bucket"""
+        return self.walk()[bucket]
@@ -0,0 +1,328 @@
+"""Watch mode: re-analyze files as they change"""
+
+import os
+import sys
+import ctypes
+import ctypes.util
+import select
+import signal
+import struct
+import time
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple, Optional, TextIO
+from datetime import datetime
+from fnmatch import fnmatchcase
+
+from .constants import WATCH_MODES
+from .findings import BugReport, dedup_findings
+from .walker import ProjectWalker
+from .baseline import FindingBaseline
+from .analyzer import CodeAnalyzer
+from .config import ConfigValidator
+from .report import SEVERITIES
+
+logger = logging.getLogger(__name__)
+
+class InotifyWatcher:
+    """File change notifications for a set of directories from Linux inotify.
+
+    Uses libc through ctypes, so it needs no extra packages or services.
+    Raises OSError where inotify is not available.
+    """
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+    # struct inotify_event without its trailing name
+    EVENT = struct.Struct('iIII')
+
+    def __init__(self):
+        if not sys.platform.startswith('linux'):
+            raise OSError("inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1: {os.strerror(errno)}")
+        # watch descriptor -> directory
+        self.directories: Dict[int, str] = {}
+
+    def watch(self, directory: str):
+        """Watch a directory (not its subdirectories); watching it again is a no-op"""
+        wd = self._add_watch(self.fd, os.fsencode(directory), self.MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_add_watch: {os.strerror(errno)}", directory)
+        self.directories[wd] = directory
+
+    def read(self, timeout: Optional[float]) -> Tuple[set, bool]:
+        """Wait up to timeout seconds and return (changed file paths, resync needed)
+
+        Paths are normalized like ProjectWalker's, e.g. a.js rather than ./a.js.
+
+        A resync is needed when a directory was created, moved or removed, or
+        when the kernel queue overflowed and events were lost.
+        """
+        changed: set = set()
+        resync = False
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return changed, resync
+
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = self.EVENT.unpack_from(data, offset)
+                offset += self.EVENT.size
+                name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+                if mask & self.IN_Q_OVERFLOW:
+                    resync = True
+                elif mask & self.IN_IGNORED:
+                    self.directories.pop(wd, None)
+                elif mask & (self.IN_ISDIR | self.IN_DELETE_SELF):
+                    resync = True
+                elif wd in self.directories:
+                    changed.add(str(Path(self.directories[wd], os.fsdecode(name))))
+        return changed, resync
+
+    def close(self):
+        os.close(self.fd)
+
+class WatchSession:
+    """Keep findings in memory and re-analyze files as they change.
+
+    The first pass analyzes the whole tree through CodeAnalyzer.analyze_all_files,
+    reusing the result cache. After that only files that were added, modified
+    or removed are analyzed again, with the analyzer's already compiled scan
+    engine, and the per-severity totals are adjusted by the difference.
+    Changes come from InotifyWatcher, or from re-walking the tree every
+    interval seconds and comparing (mtime, size) signatures when inotify is
+    not available. A change to a package.json or .env file re-runs the config
+    checks.
+    """
+
+    MODES = WATCH_MODES
+    CONFIG_KEY = '<config>'
+    # Events that arrive within this many seconds are handled as one change
+    SETTLE_SECONDS = 0.05
+    MAX_LISTED = 10
+
+    def __init__(self, analyzer: CodeAnalyzer, jobs: int = 1, dedup: bool = True,
+                 baseline: Optional[FindingBaseline] = None, stream: Optional[TextIO] = None):
+        self.analyzer = analyzer
+        self.root_path = analyzer.root_path
+        self.jobs = jobs
+        self.dedup = dedup
+        self.baseline = baseline
+        self.stream = stream or sys.stdout
+        self.walker: Optional[ProjectWalker] = None
+        # path -> (st_mtime_ns, st_size) of the JS and config files last analyzed
+        self.signatures: Dict[str, Tuple[int, int]] = {}
+        self.config_signatures: Dict[str, Tuple[int, int]] = {}
+        # path -> findings; config findings are kept under CONFIG_KEY
+        self.findings: Dict[str, List[BugReport]] = {}
+        self.severity_counts = {severity: 0 for severity in SEVERITIES}
+        self.total = 0
+
+    @staticmethod
+    def _signature(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _walk(self) -> ProjectWalker:
+        self.walker = ProjectWalker(self.root_path, self.analyzer.walker.ignored_dirs,
+                                    self.analyzer.walker.use_gitignore)
+        self.walker.walk()
+        return self.walker
+
+    def _filter(self, bugs: List[BugReport]) -> List[BugReport]:
+        if self.dedup:
+            bugs = dedup_findings(bugs)
+        if self.baseline is not None:
+            bugs, _ = self.baseline.filter(bugs)
+        return bugs
+
+    def _set_findings(self, key: str, bugs: List[BugReport]) -> Tuple[List[BugReport], int]:
+        """Replace the findings of one file, adjust the totals and return (added findings, removed count)"""
+        old = self.findings.pop(key, [])
+        for bug in old:
+            self.severity_counts[bug.severity] = self.severity_counts.get(bug.severity, 0) - 1
+        for bug in bugs:
+            self.severity_counts[bug.severity] = self.severity_counts.get(bug.severity, 0) + 1
+        self.total += len(bugs) - len(old)
+        if bugs:
+            self.findings[key] = bugs
+
+        def identity(bug: BugReport) -> Tuple:
+            return bug.rule, bug.line_number, bug.code_snippet
+
+        remaining: Dict[Tuple, int] = {}
+        for bug in old:
+            remaining[identity(bug)] = remaining.get(identity(bug), 0) + 1
+        added = []
+        for bug in bugs:
+            count = remaining.get(identity(bug), 0)
+            if count:
+                remaining[identity(bug)] = count - 1
+            else:
+                added.append(bug)
+        return added, sum(remaining.values())
+
+    def start(self) -> List[str]:
+        """Analyze the whole tree and return the directories to watch"""
+        walker = self._walk()
+        self.analyzer.walker = walker
+        by_file: Dict[str, List[BugReport]] = {}
+        for bug in self.analyzer.analyze_all_files(jobs=self.jobs):
+            by_file.setdefault(bug.file_path, []).append(bug)
+        for file_path in walker.files('js'):
+            path = str(file_path)
+            self.signatures[path] = self._signature(path)
+            self._set_findings(path, self._filter(by_file.get(path, [])))
+        self._validate_configs(walker)
+        return walker.directories
+
+    def _validate_configs(self, walker: ProjectWalker) -> Tuple[List[BugReport], int]:
+        self.config_signatures = {
+            str(path): self._signature(str(path))
+            for path in walker.files('package_json') + walker.files('env')
+        }
+        config_bugs = ConfigValidator(str(self.root_path), walker=walker).validate_configs()
+        return self._set_findings(self.CONFIG_KEY, self._filter(config_bugs))
+
+    def refresh(self, paths: Iterable[str]):
+        """Re-analyze the given JS files, or forget them if they are gone, and print what changed"""
+        # Findings and signatures are keyed by the walker's normalized paths
+        for path in sorted({str(Path(path)) for path in paths}):
+            signature = self._signature(path)
+            if signature is not None and signature == self.signatures.get(path):
+                continue
+            start = time.perf_counter()
+            if signature is None:
+                self.signatures.pop(path, None)
+                bugs: List[BugReport] = []
+            else:
+                self.signatures[path] = signature
+                bugs, route_index, _ = self.analyzer.scan_file(Path(path))
+                cache = self.analyzer.cache
+                digest = cache.file_digest(Path(path)) if cache else None
+                if digest:
+                    cache.store(Path(path), digest, bugs, route_index)
+                bugs = self._filter(bugs)
+            added, removed = self._set_findings(path, bugs)
+            self._print_change(path, os.path.relpath(path, self.root_path), signature is None,
+                               added, removed, time.perf_counter() - start)
+
+    def resync(self) -> List[str]:
+        """Re-walk the tree, refresh every file whose signature changed and return the directories"""
+        walker = self._walk()
+        live = {str(path) for path in walker.files('js')}
+        changed = {path for path in live if self._signature(path) != self.signatures.get(path)}
+        changed.update(path for path in self.signatures if path not in live)
+        self.refresh(changed)
+
+        configs = walker.files('package_json') + walker.files('env')
+        if {str(path): self._signature(str(path)) for path in configs} != self.config_signatures:
+            start = time.perf_counter()
+            added, removed = self._validate_configs(walker)
+            self._print_change(self.CONFIG_KEY, 'configuration files', False,
+                               added, removed, time.perf_counter() - start)
+        return walker.directories
+
+    def summary(self) -> str:
+        counts = ", ".join(f"{severity} {self.severity_counts.get(severity, 0)}" for severity in SEVERITIES)
+        return f"total {self.total} ({counts})"
+
+    def _print_change(self, key: str, label: str, deleted: bool, added: List[BugReport],
+                      removed: int, seconds: float):
+        count = len(self.findings.get(key, []))
+        state = "deleted" if deleted else f"{count} issue{'s' if count != 1 else ''}"
+        print(f"[{datetime.now():%H:%M:%S}] {label}: {state} (+{len(added)} -{removed}) "
+              f"in {seconds * 1000:.1f} ms | {self.summary()}", file=self.stream, flush=True)
+        for bug in added[:self.MAX_LISTED]:
+            print(f"   + {bug.severity.upper()} {bug.category} line {bug.line_number}: {bug.code_snippet[:100]}",
+                  file=self.stream, flush=True)
+        if len(added) > self.MAX_LISTED:
+            print(f"   ... and {len(added) - self.MAX_LISTED} more", file=self.stream, flush=True)
+
+    def _is_config(self, path: str) -> bool:
+        name = os.path.basename(path)
+        return any(fnmatchcase(name, ProjectWalker.BUCKETS[bucket]) for bucket in ('package_json', 'env'))
+
+    @staticmethod
+    def _interrupt(signum, frame):
+        raise KeyboardInterrupt
+
+    def run(self, mode: str = 'auto', interval: float = 1.0):
+        """Watch until interrupted by Ctrl-C or SIGTERM"""
+        if mode not in self.MODES:
+            raise ValueError(f"mode must be one of {self.MODES}")
+        previous_handler = signal.signal(signal.SIGTERM, self._interrupt)
+        start = time.perf_counter()
+        directories = self.start()
+
+        watcher = None
+        if mode != 'poll':
+            try:
+                watcher = InotifyWatcher()
+                for directory in directories:
+                    watcher.watch(directory)
+            except OSError as e:
+                if watcher is not None:
+                    watcher.close()
+                    watcher = None
+                if mode == 'inotify':
+                    raise
+                logger.warning(f"inotify unavailable ({e}); polling every {interval}s")
+
+        how = "inotify" if watcher else f"polling every {interval}s"
+        print(f"Watching {len(self.signatures)} JavaScript files under {self.root_path} ({how}); "
+              f"initial scan {time.perf_counter() - start:.2f}s | {self.summary()}", file=self.stream, flush=True)
+        try:
+            while True:
+                if watcher is None:
+                    time.sleep(interval)
+                    self.resync()
+                    continue
+                changed, resync = watcher.read(None)
+                # Let the rest of a save (temp file, rename, ...) arrive
+                while True:
+                    more, more_resync = watcher.read(self.SETTLE_SECONDS)
+                    if not more and not more_resync:
+                        break
+                    changed |= more
+                    resync = resync or more_resync
+                if resync or any(self._is_config(path) for path in changed):
+                    for directory in self.resync():
+                        watcher.watch(directory)
+                else:
+                    self.refresh(path for path in changed if fnmatchcase(os.path.basename(path),
+                                                                         ProjectWalker.BUCKETS['js']))
+        except KeyboardInterrupt:
+            print("Stopped watching", file=self.stream, flush=True)
+        finally:
+            signal.signal(signal.SIGTERM, previous_handler)
+            if watcher is not None:
+                watcher.close()
+            if self.analyzer.cache:
+                self.analyzer.cache.save([Path(path) for path in self.signatures])
@@ -0,0 +1,45 @@
+import os
+import sys
+import socket
+import contextlib
+
+import pytest
+from aiohttp import web
+
+# Make the bugdetector package importable when pytest runs from any directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@contextlib.asynccontextmanager
+async def _stand_in(handler=None):
+    """Serve every path on a local port; yield (base URL, list of (method, path, q) requests seen)"""
+    seen = []
+
+    async def record(request):
+        seen.append((request.method, request.path, request.query.get('q')))
+        if handler is not None:
+            return await handler(request)
+        return web.Response(text='ok')
+
+    app = web.Application()
+    app.router.add_route('*', '/{tail:.*}', record)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    try:
+        yield f'http://127.0.0.1:{runner.addresses[0][1]}', seen
+    finally:
+        await runner.cleanup()
+
+@pytest.fixture
+def stand_in():
+    """A local aiohttp.web stand-in for the services the API tester probes"""
+    return _stand_in
+
+@pytest.fixture
+def closed_port_url():
+    """Return a base URL on a local port nothing listens on"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    return f'http://127.0.0.1:{port}'
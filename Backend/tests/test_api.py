@@ -0,0 +1,138 @@
+import time
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from bugdetector import BugDetector, Endpoint
+from bugdetector.api import APITester
+
+CATALOGUE = [
+    Endpoint('GET', '/api/users/:id', 'routes/users.js', 3),
+    Endpoint('DELETE', '/api/users/delete/:id', 'routes/users.js', 7),
+    Endpoint('POST', '/api/users', 'routes/users.js', 11),
+    Endpoint('ALL', '/api/ping', 'routes/ping.js', 2),
+]
+
+def test_catalogue_probes_only_use_safe_methods_by_default(stand_in):
+    async def run():
+        async with stand_in() as (base_url, seen):
+            await APITester([base_url], catalogue=CATALOGUE).test_endpoints()
+        return seen
+
+    seen = asyncio.run(run())
+    assert {(method, path) for method, path, _ in seen} == {('GET', '/api/users/1'), ('GET', '/api/ping')}
+
+def test_unsafe_methods_probe_routes_with_their_own_method(stand_in):
+    async def run():
+        async with stand_in() as (base_url, seen):
+            await APITester([base_url], catalogue=CATALOGUE, unsafe_methods=True).test_endpoints()
+        return seen
+
+    requested = {(method, path) for method, path, _ in asyncio.run(run())}
+    assert requested == {('GET', '/api/users/1'), ('DELETE', '/api/users/delete/1'),
+                         ('POST', '/api/users'), ('POST', '/api/ping'), ('GET', '/api/ping')}
+
+def test_fixed_endpoints_send_sql_payloads_in_the_query_string(stand_in):
+    async def run():
+        async with stand_in() as (base_url, seen):
+            await APITester([base_url], endpoints=['/api/auth/login']).test_endpoints()
+        return seen
+
+    seen = asyncio.run(run())
+    assert {method for method, _, _ in seen} == {'GET'}
+    assert {q for _, _, q in seen} >= set(APITester.SQL_PAYLOADS)
+
+def test_network_checks_require_explicit_base_urls(tmp_path):
+    with pytest.raises(ValueError):
+        BugDetector(str(tmp_path), api_test=True)
+    with pytest.raises(ValueError):
+        BugDetector(str(tmp_path), load_targets=[('GET', '/health')])
+
+def test_load_test_refuses_unsafe_methods_without_opt_in():
+    with pytest.raises(ValueError, match='DELETE'):
+        asyncio.run(APITester(['http://127.0.0.1:9']).load_test([('DELETE', '/api/users/1')], duration=0.1))
+
+def test_probes_run_concurrently_within_the_per_host_limit(stand_in):
+    in_flight = 0
+    peak = 0
+
+    async def slow(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.1)
+        in_flight -= 1
+        return web.Response(text='ok')
+
+    async def run(limit):
+        async with stand_in(slow) as (base_url, seen):
+            start = time.perf_counter()
+            await APITester([base_url], endpoints=['/a', '/b'], per_host_limit=limit).test_endpoints()
+            return time.perf_counter() - start, len(seen)
+
+    # 12 probes of 0.1s each: all at once take about as long as one
+    elapsed, requests = asyncio.run(run(12))
+    assert requests == 12 and peak == 12 and elapsed < 0.6
+    peak = 0
+    asyncio.run(run(3))
+    assert peak == 3
+
+def test_gateway_errors_are_retried_with_backoff(stand_in):
+    attempts = {}
+
+    async def flaky(request):
+        key = request.query.get('q')
+        attempts[key] = attempts.get(key, 0) + 1
+        return web.Response(status=503 if attempts[key] < 3 else 500)
+
+    async def run():
+        async with stand_in(flaky) as (base_url, seen):
+            tester = APITester([base_url], endpoints=['/login'], retries=2, backoff=0.01)
+            return await tester.test_endpoints()
+
+    bugs = asyncio.run(run())
+    # Every probe succeeded on its third attempt; the 500s are SQL findings
+    assert set(attempts.values()) == {3}
+    assert len(bugs) == len(APITester.SQL_PAYLOADS)
+    assert all(bug.severity == 'critical' for bug in bugs)
+
+def test_unreachable_host_is_skipped_without_stalling_the_others(stand_in, closed_port_url):
+    async def run():
+        async with stand_in() as (base_url, seen):
+            tester = APITester([closed_port_url, base_url], endpoints=['/a'], retries=1, backoff=0.01)
+            start = time.perf_counter()
+            bugs = await tester.test_endpoints()
+            return bugs, seen, time.perf_counter() - start, tester
+
+    bugs, seen, elapsed, tester = asyncio.run(run())
+    assert bugs == [] and len(seen) == 6 and elapsed < 2
+    assert len(tester._unreachable) == 1
+
+def test_read_timeout_bounds_a_hung_endpoint(stand_in):
+    async def hang(request):
+        await asyncio.sleep(5)
+        return web.Response(text='late')
+
+    async def run():
+        async with stand_in(hang) as (base_url, seen):
+            start = time.perf_counter()
+            bugs = await APITester([base_url], endpoints=['/a'], read_timeout=0.2, retries=0).test_endpoints()
+            return bugs, time.perf_counter() - start
+
+    bugs, elapsed = asyncio.run(run())
+    assert bugs == [] and elapsed < 2
+
+def test_findings_of_catalogued_routes_point_at_their_definition(stand_in):
+    async def reflect(request):
+        if request.query.get('q') in APITester.SQL_PAYLOADS:
+            return web.Response(status=500)
+        return web.Response(text=f"<p>{request.query.get('q')}</p>", content_type='text/html')
+
+    async def run():
+        async with stand_in(reflect) as (base_url, seen):
+            return await APITester([base_url], catalogue=CATALOGUE[:1]).test_endpoints()
+
+    bugs = asyncio.run(run())
+    assert sorted(bug.severity for bug in bugs) == ['critical'] * 3 + ['high'] * 3
+    assert {(bug.file_path, bug.line_number) for bug in bugs} == {('routes/users.js', 3)}
@@ -0,0 +1,40 @@
+import json
+
+from bugdetector import CodeAnalyzer
+from bugdetector.constants import MAX_SNIPPET_CHARS
+
+# One statement with findings from several categories; repeated without
+# newlines it makes a minified bundle of a single very long line
+MINIFIED_CHUNK = ('function f(a){eval(a);document.write(a);'
+                  'fetch("http://localhost:3000/api");setInterval(g,10)}')
+
+def _write_minified(root, size):
+    path = root / 'bundle.min.js'
+    path.write_text(MINIFIED_CHUNK * (size // len(MINIFIED_CHUNK)))
+    return path
+
+def test_snippets_of_long_lines_are_windows_around_the_match(tmp_path):
+    _write_minified(tmp_path, 64 * 1024)
+    bugs = CodeAnalyzer(str(tmp_path)).analyze_all_files()
+
+    assert len(bugs) > 500
+    assert all(len(bug.code_snippet) <= MAX_SNIPPET_CHARS + 6 for bug in bugs)
+    # The window starts before the match, so the matched text is in the snippet
+    xss = [bug for bug in bugs if bug.category == 'xss_vulnerability']
+    assert xss and all('eval(' in bug.code_snippet or 'document.write(' in bug.code_snippet for bug in xss)
+    assert all(bug.code_snippet.startswith('...') for bug in xss if bug.column_number > MAX_SNIPPET_CHARS)
+
+def test_cache_of_minified_file_stays_small_and_round_trips(tmp_path):
+    source = tmp_path / 'src'
+    source.mkdir()
+    _write_minified(source, 64 * 1024)
+    cache_path = tmp_path / 'cache.json'
+
+    first = CodeAnalyzer(str(source), cache_path=str(cache_path)).analyze_all_files()
+    size = cache_path.stat().st_size
+    # Each cached finding holds at most one snippet window plus fixed fields
+    assert size < len(first) * (MAX_SNIPPET_CHARS + 600)
+
+    second = CodeAnalyzer(str(source), cache_path=str(cache_path)).analyze_all_files()
+    assert [bug.to_dict() for bug in second] == [bug.to_dict() for bug in first]
+    assert json.loads(cache_path.read_text())['format'] == 3
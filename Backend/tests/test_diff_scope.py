@@ -0,0 +1,40 @@
+import subprocess
+
+import pytest
+
+from bugdetector import BugDetector
+from bugdetector.diff_scope import GitDiffScope
+
+def _git(root, *args):
+    subprocess.run(['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', *args],
+                   cwd=root, check=True, capture_output=True)
+
+@pytest.fixture
+def repo(tmp_path):
+    (tmp_path / 'a').mkdir()
+    (tmp_path / 'b').mkdir()
+    (tmp_path / 'a' / 'package.json').write_text('{"dependencies": {"lodash": "1"}, "scripts": {}}')
+    (tmp_path / 'b' / 'package.json').write_text('{"dependencies": {"lodash": "1"}, "scripts": {}}')
+    (tmp_path / 'my file.js').write_text('var a = 1;\n')
+    _git(tmp_path, 'init', '-q')
+    _git(tmp_path, 'add', '-A')
+    _git(tmp_path, 'commit', '-q', '-m', 'initial')
+    return tmp_path
+
+def test_changed_file_with_space_in_its_name_is_scanned(repo):
+    (repo / 'my file.js').write_text('var a = 1;\neval(x);\n')
+    scope = GitDiffScope(str(repo), 'HEAD', changed_lines_only=True).load()
+
+    assert scope.js_files() == [repo / 'my file.js']
+    assert scope.changes[str(repo / 'my file.js')] == [(2, 2)]
+
+def test_config_checks_only_cover_changed_config_files(repo):
+    (repo / 'b' / 'package.json').write_text('{"dependencies": {"moment": "1"}, "scripts": {}}')
+    scope = GitDiffScope(str(repo), 'HEAD', changed_lines_only=True).load()
+    results = BugDetector(str(repo), diff_scope=scope).run_static_tests()
+
+    assert {bug.file_path for bug in results['config_validation']} == {str(repo / 'b' / 'package.json')}
+
+def test_bad_revision_raises_runtime_error(repo):
+    with pytest.raises(RuntimeError, match='bad revision'):
+        GitDiffScope(str(repo), 'no-such-ref').load()
@@ -0,0 +1,21 @@
+from bugdetector import BugDetector
+from bugdetector.findings import BugReport, dedup_findings
+
+def _bug(column, match_count=1):
+    return BugReport('critical', 'xss_vulnerability', 'a.js', 1, 'Use of eval', 'Avoid eval',
+                     'eval(eval(x))', column_number=column, match_count=match_count)
+
+def test_dedup_leaves_its_input_unchanged():
+    bugs = [_bug(1, 2), _bug(6)]
+    merged = dedup_findings(bugs)
+    assert [bug.match_count for bug in bugs] == [2, 1]
+    assert [bug.match_count for bug in merged] == [3]
+    assert [bug.match_count for bug in dedup_findings(bugs)] == [3]
+
+def test_static_run_keeps_the_analyzer_findings_intact(tmp_path):
+    (tmp_path / 'a.js').write_text('eval(eval(x));\n')
+    detector = BugDetector(str(tmp_path))
+    results = detector.run_static_tests()
+    before = [bug.match_count for bug in detector.code_analyzer.bugs]
+    assert dedup_findings(detector.code_analyzer.bugs) == results['static_analysis']
+    assert [bug.match_count for bug in detector.code_analyzer.bugs] == before
@@ -0,0 +1,82 @@
+import random
+import asyncio
+
+from aiohttp import web
+
+from bugdetector import BugDetector
+from bugdetector.api import APITester, LatencyHistogram
+
+def test_histogram_percentiles_stay_within_precision():
+    rng = random.Random(0)
+    samples = [rng.expovariate(20) for _ in range(20000)]
+    histogram = LatencyHistogram(precision=0.01)
+    for value in samples:
+        histogram.add(value)
+
+    samples.sort()
+    for q in (0.5, 0.95, 0.99):
+        exact = samples[int(q * len(samples)) - 1]
+        assert abs(histogram.percentile(q) - exact) <= 0.02 * exact
+    assert histogram.max == samples[-1] and histogram.count == len(samples)
+    # Memory is bounded by the bucket count, not the sample count
+    assert len(histogram.buckets) < 1000
+
+def test_closed_loop_load_records_latency_errors_and_statuses(stand_in):
+    calls = 0
+
+    async def handler(request):
+        nonlocal calls
+        calls += 1
+        status = 500 if calls % 4 == 0 else 200
+        await asyncio.sleep(0.02)
+        return web.Response(status=status)
+
+    async def run():
+        async with stand_in(handler) as (base_url, seen):
+            results = await APITester([base_url]).load_test([('GET', '/health')], duration=0.5, concurrency=4)
+            return results, seen
+
+    (stats,), seen = asyncio.run(run())
+    summary = stats.summary()
+    assert summary['requests'] == len(seen) > 20
+    assert {(method, path) for method, path, _ in seen} == {('GET', '/health')}
+    assert 0.2 <= summary['error_rate'] <= 0.3
+    assert summary['statuses']['5xx'] == stats.errors
+    assert 0.02 <= summary['p50'] <= summary['p95'] <= summary['p99'] <= summary['max']
+    # Four workers against a 20ms endpoint: close to 200 requests per second
+    assert summary['throughput'] > 60
+
+def test_fixed_rate_load_drops_ticks_when_the_limit_is_reached(stand_in):
+    async def slow(request):
+        await asyncio.sleep(0.2)
+        return web.Response(text='ok')
+
+    async def run():
+        async with stand_in(slow) as (base_url, seen):
+            return await APITester([base_url]).load_test([('GET', '/')], duration=0.5, rate=40, concurrency=2)
+
+    (stats,) = asyncio.run(run())
+    # 20 ticks in 0.5s, but two requests in flight take 0.2s each
+    assert stats.requests <= 8
+    assert stats.dropped >= 10
+    assert stats.requests + stats.dropped in range(19, 22)
+
+def test_unreachable_host_stops_its_load_early(closed_port_url):
+    async def run():
+        return await APITester([closed_port_url]).load_test([('GET', '/')], duration=5, concurrency=2)
+
+    (stats,) = asyncio.run(run())
+    assert stats.unreachable and stats.elapsed < 1
+    assert stats.summary()['error_rate'] == 1.0
+
+def test_load_results_get_their_own_report_section(tmp_path, stand_in):
+    async def run():
+        async with stand_in() as (base_url, seen):
+            detector = BugDetector(str(tmp_path), api_urls=[base_url], load_targets=[('GET', '/health')],
+                                   load_duration=0.2, load_concurrency=2)
+            return detector, await detector.run_all_tests()
+
+    detector, results = asyncio.run(run())
+    report = detector.generate_report(results)
+    assert 'LOAD TEST' in report.upper()
+    assert '/health' in report and 'p95' in report
@@ -0,0 +1,47 @@
+import io
+import json
+
+import pytest
+
+from bugdetector import BugReport
+from bugdetector.report import REPORT_WRITERS
+
+def _results():
+    return {
+        'static_analysis': [
+            BugReport('critical', 'xss_vulnerability', '/r/a.js', 3, 'Use of eval', 'Avoid eval',
+                      'eval(x)', column_number=1),
+            BugReport('critical', 'xss_vulnerability', '/r/b.js', 7, 'Use of eval', 'Avoid eval',
+                      'eval(y)', match_count=2),
+            BugReport('low', 'logic_errors', '/r/a.js', 9, 'Loose equality', 'Use ==='),
+        ],
+        'config_validation': [BugReport('info', 'config', '/r/.env', 0, 'Note', 'Check it')],
+    }
+
+def _write(name, group_by_rule):
+    stream = io.StringIO()
+    writer = REPORT_WRITERS[name](stream, '/r', group_by_rule)
+    writer.begin()
+    for category, bugs in _results().items():
+        writer.write_section(category, bugs)
+    writer.finish()
+    assert writer.total == 4
+    return stream.getvalue()
+
+@pytest.mark.parametrize('group_by_rule', [False, True])
+@pytest.mark.parametrize('name', sorted(REPORT_WRITERS))
+def test_every_writer_writes_every_finding(name, group_by_rule):
+    output = _write(name, group_by_rule)
+    if name == 'sarif':
+        results = json.loads(output)['runs'][0]['results']
+        assert len(results) == 4
+        assert {result['locations'][0]['physicalLocation']['artifactLocation']['uri']
+                for result in results} == {'a.js', 'b.js', '.env'}
+    elif name == 'jsonl':
+        records = [json.loads(line) for line in output.splitlines()]
+        assert records[0]['type'] == 'run' and records[-1]['type'] == 'summary'
+        assert records[-1]['total'] == 4 and records[-1]['matches'] == 5
+        kind = 'rule_group' if group_by_rule else 'finding'
+        assert len([record for record in records if record['type'] == kind]) == (3 if group_by_rule else 4)
+    else:
+        assert 'Total Issues Found: 4' in output and 'INFO SEVERITY:' in output
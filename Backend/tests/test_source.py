@@ -0,0 +1,56 @@
+from bugdetector import CodeAnalyzer
+from bugdetector.source import JsSourceViews
+
+def _categories(root, source, structural=False):
+    (root / 'app.js').write_text(source)
+    return [(bug.line_number, bug.category)
+            for bug in CodeAnalyzer(str(root), structural=structural).analyze_all_files()]
+
+def test_regex_literal_bodies_are_code_not_strings():
+    views = JsSourceViews('const re = /localhost:3000|}/;\nlet s = "x";\n')
+    assert 'localhost:3000|}' in views.text('code')
+    assert 'localhost' not in views.text('strings')
+    assert views.text('strings').strip() == 'x'
+
+def test_regex_literals_keep_the_default_findings(tmp_path):
+    found = _categories(tmp_path, 'const a = /localhost:3000/;\n'
+                                  'const b = /document.write(x)/;\n')
+    assert (1, 'config_issues') not in found
+    assert (2, 'xss_vulnerability') in found
+
+def test_braces_in_regex_literals_do_not_open_blocks(tmp_path):
+    source = ('for (;;) {\n'
+              '  const re = /}/;\n'
+              '  for (;;) {\n'
+              '    for (;;) { x(); }\n'
+              '  }\n'
+              '}\n')
+    found = _categories(tmp_path, source, structural=True)
+    assert found.count((1, 'performance_issues')) == 1
+
+# Findings hidden by masking: in comments, strings and regex literals
+MASKED_SOURCE = ('// eval(commented);\n'
+                 'const s = "eval(in_string)"; const t = `document.write(${a})`;\n'
+                 "const url = 'http://localhost:3000/'; const re = /localhost:4000/;\n"
+                 '/* setInterval(f, 10) */ eval(real);\n'
+                 'app.get("/x", (req, res) => { for (;;) { for (;;) { for (;;) { res.send(1); } } } });\n')
+
+def test_large_files_get_the_findings_of_small_ones(tmp_path):
+    for structural in (False, True):
+        findings = []
+        for threshold in (0, 1):
+            (tmp_path / 'app.js').write_text(MASKED_SOURCE * 50)
+            analyzer = CodeAnalyzer(str(tmp_path), large_file_threshold=threshold, structural=structural)
+            findings.append([bug.to_dict() for bug in analyzer.analyze_all_files()])
+        assert findings[0] and findings[0] == findings[1]
+
+def test_inline_ignore_covers_next_line_only_when_alone(tmp_path):
+    source = ('eval(a); // bugdetector-ignore xss_vulnerability\n'
+              'eval(b);\n'
+              '  // bugdetector-ignore xss_vulnerability\n'
+              'eval(c);\n'
+              'const s = "// bugdetector-ignore"; eval(d);\n')
+    for threshold in (0, 1):
+        (tmp_path / 'app.js').write_text(source)
+        bugs = CodeAnalyzer(str(tmp_path), large_file_threshold=threshold).analyze_all_files()
+        assert sorted(bug.line_number for bug in bugs if bug.category == 'xss_vulnerability') == [2, 5]
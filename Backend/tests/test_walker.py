@@ -0,0 +1,31 @@
+from bugdetector.walker import ProjectWalker
+
+def _tree(root, files):
+    for name, text in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+def _js(root):
+    return [path.relative_to(root).as_posix() for path in ProjectWalker(str(root)).files('js')]
+
+def test_gitignore_negation_re_includes_a_directory(tmp_path):
+    _tree(tmp_path, {'.gitignore': '/*\n!/svc/\n', 'svc/src/a.js': '', 'other/b.js': '', 'c.js': ''})
+    # Rules only prune directories, so c.js stays
+    assert _js(tmp_path) == ['c.js', 'svc/src/a.js']
+
+def test_gitignore_last_matching_rule_wins(tmp_path):
+    _tree(tmp_path, {
+        '.gitignore': 'gen\n',
+        'app/.gitignore': '!gen\n',
+        'app/gen/a.js': '',
+        'lib/gen/b.js': '',
+        'lib/keep.js': '',
+        'vendor/x/c.js': '',
+        'vendor/.gitignore': '*\n!x\n',
+    })
+    assert _js(tmp_path) == ['app/gen/a.js', 'lib/keep.js', 'vendor/x/c.js']
+
+def test_anchored_gitignore_patterns_only_match_at_their_depth(tmp_path):
+    _tree(tmp_path, {'.gitignore': '/*/tmp\n', 'a/tmp/x.js': '', 'a/b/tmp/y.js': ''})
+    assert _js(tmp_path) == ['a/b/tmp/y.js']
@@ -0,0 +1,40 @@
+import io
+import sys
+
+import pytest
+
+from bugdetector import CodeAnalyzer
+from bugdetector.watch import InotifyWatcher, WatchSession
+
+def _session():
+    return WatchSession(CodeAnalyzer('.'), stream=io.StringIO())
+
+def test_changes_under_a_relative_root_replace_the_old_findings(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'a.js').write_text('eval(a);\n')
+    session = _session()
+    session.start()
+    assert session.total == 1
+
+    (tmp_path / 'a.js').write_text('eval(a);\neval(b);\n')
+    session.refresh({'./a.js'})
+    assert session.total == 2
+    assert list(session.findings) == ['a.js']
+    assert '+1 -0' in session.stream.getvalue()
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='inotify is Linux only')
+def test_inotify_paths_match_the_walker_keys(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'a.js').write_text('eval(a);\n')
+    session = _session()
+    watcher = InotifyWatcher()
+    try:
+        for directory in session.start():
+            watcher.watch(directory)
+        (tmp_path / 'a.js').write_text('eval(a);\neval(b);\n')
+        changed, _ = watcher.read(5)
+    finally:
+        watcher.close()
+    assert changed == {'a.js'}
+    session.refresh(changed)
+    assert session.total == 2